@@ -1,23 +1,203 @@
-from django.contrib import admin
+from datetime import timedelta
 
-from .models import Post, Category, Location, Comment
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Min
+from django.utils import timezone
+
+from . import moderation
+from .models import Post, Category, Location, Comment, ModerationAction
+from .pagination import EstimatedCountPaginator
+
+
+def period_start(value, kind):
+    value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if kind == 'day':
+        return value
+    if kind == 'month':
+        return value.replace(day=1)
+    return value.replace(month=1, day=1)
+
+
+def next_period(start, kind):
+    if kind == 'day':
+        return start + timedelta(days=1)
+    if kind == 'month':
+        return start.replace(
+            year=start.year + start.month // 12, month=start.month % 12 + 1
+        )
+    return start.replace(year=start.year + 1)
+
+
+class IndexedDatesMixin:
+    """
+    QuerySet listing years, months and days by seeking along an index.
+
+    ``datetimes()`` runs one ``MIN()`` per period, starting after the
+    previous one, instead of truncating every row; the date hierarchy
+    then costs as many index lookups as there are links. Other kinds
+    fall back to the default implementation.
+    """
+
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None):
+        if kind not in ('year', 'month', 'day'):
+            return super().datetimes(field_name, kind, order, tzinfo)
+        queryset = self.order_by()
+        periods = []
+        while True:
+            first = queryset.aggregate(first=Min(field_name))['first']
+            if first is None:
+                break
+            if timezone.is_aware(first):
+                first = timezone.localtime(first, tzinfo)
+            periods.append(period_start(first, kind))
+            queryset = self.order_by().filter(**{
+                f'{field_name}__gte': next_period(periods[-1], kind)
+            })
+        return periods if order == 'ASC' else periods[::-1]
+
+
+_indexed_dates_classes = {}
+
+
+def with_indexed_dates(queryset):
+    """Return a copy of the queryset with ``IndexedDatesMixin`` mixed in."""
+    base = type(queryset)
+    if base not in _indexed_dates_classes:
+        _indexed_dates_classes[base] = type(
+            f'IndexedDates{base.__name__}', (IndexedDatesMixin, base), {}
+        )
+    clone = queryset._chain()
+    clone.__class__ = _indexed_dates_classes[base]
+    return clone
+
+
+class IndexedDatesChangeList(ChangeList):
+    """Changelist whose date hierarchy seeks along the index."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        return with_indexed_dates(
+            super().get_queryset(request, exclude_parameters)
+        )
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist that never counts the whole table twice.
+
+    The date hierarchy links are found with index seeks, see
+    ``IndexedDatesMixin``; ``date_hierarchy`` should name an indexed field.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return IndexedDatesChangeList
+
+    def get_actions(self, request):
+        """Drop the stock action that deletes rows one by one."""
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(), required=False, label='Категория'
+    )
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(LargeTableAdmin):
     list_display = ('title', 'author', 'pub_date', 'is_published', 'category')
+    list_select_related = ('author', 'category')
+    autocomplete_fields = ('author', 'category', 'location')
+    search_fields = ('title',)
+    date_hierarchy = 'pub_date'
+    action_form = PostActionForm
+    actions = (
+        'publish_posts', 'unpublish_posts', 'move_posts', 'delete_posts'
+    )
+
+    @admin.action(permissions=('change',), description='Опубликовать')
+    def publish_posts(self, request, queryset):
+        count = moderation.set_posts_published(queryset, True, request.user)
+        self.message_user(request, f'Опубликовано публикаций: {count}.')
+
+    @admin.action(permissions=('change',), description='Снять с публикации')
+    def unpublish_posts(self, request, queryset):
+        count = moderation.set_posts_published(
+            queryset, False, request.user
+        )
+        self.message_user(request, f'Снято с публикации: {count}.')
+
+    @admin.action(
+        permissions=('change',),
+        description='Перенести в выбранную категорию'
+    )
+    def move_posts(self, request, queryset):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if not form.is_valid() or form.cleaned_data['category'] is None:
+            self.message_user(
+                request, 'Выберите категорию для переноса.', messages.ERROR
+            )
+            return
+        category = form.cleaned_data['category']
+        count = moderation.move_posts(queryset, category, request.user)
+        self.message_user(
+            request, f'Перенесено в «{category}» публикаций: {count}.'
+        )
+
+    @admin.action(permissions=('delete',), description='Удалить')
+    def delete_posts(self, request, queryset):
+        count = moderation.delete_posts(queryset, request.user)
+        self.message_user(request, f'Удалено публикаций: {count}.')
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ('title', 'slug', 'is_published')
+    search_fields = ('title', 'slug')
 
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
     list_display = ('name', 'is_published')
+    search_fields = ('name',)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdmin):
     list_display = ('author', 'post', 'text', 'created_at')
+    list_select_related = ('author', 'post')
+    autocomplete_fields = ('author', 'post')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+    actions = ('delete_comments',)
+
+    @admin.action(permissions=('delete',), description='Удалить')
+    def delete_comments(self, request, queryset):
+        count = moderation.delete_comments(queryset, request.user)
+        self.message_user(request, f'Удалено комментариев: {count}.')
+
+
+@admin.register(ModerationAction)
+class ModerationActionAdmin(admin.ModelAdmin):
+    list_display = (
+        'created_at', 'moderator', 'action', 'target', 'object_count'
+    )
+    list_filter = ('action', 'target')
+    list_select_related = ('moderator',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
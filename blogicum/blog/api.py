@@ -0,0 +1,254 @@
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+
+from django.contrib.auth.models import User
+
+from .models import Category, Comment, Location
+from .pagination import KeysetPaginator
+from .views import get_post_queryset, get_published_category
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class Field:
+    """A public field: the columns it reads and how to serialize it."""
+
+    def __init__(self, *columns, related=None, value=None):
+        self.columns = columns
+        self.related = related
+        self.value = value
+
+    def serialize(self, obj, name):
+        if self.value is not None:
+            return self.value(obj)
+        return getattr(obj, name)
+
+
+POST_FIELDS = {
+    'id': Field('id'),
+    'title': Field('title'),
+    'text': Field('text'),
+    'pub_date': Field('pub_date'),
+    'updated_at': Field('updated_at'),
+    'comment_count': Field('comment_count'),
+    'image': Field(
+        'image', value=lambda post: post.image.url if post.image else None
+    ),
+    'author': Field(
+        'author__username', related='author',
+        value=lambda post: post.author.username
+    ),
+    'category': Field(
+        'category',
+        value=lambda post: post.category and {
+            'slug': post.category.slug, 'title': post.category.title
+        }
+    ),
+    'location': Field(
+        'location',
+        value=lambda post: post.location.name if (
+            post.location and post.location.is_published
+        ) else None
+    ),
+}
+POST_DEFAULT_FIELDS = (
+    'id', 'title', 'pub_date', 'author', 'category', 'comment_count'
+)
+
+COMMENT_FIELDS = {
+    'id': Field('id'),
+    'text': Field('text'),
+    'created_at': Field('created_at'),
+    'author': Field(
+        'author__username', related='author',
+        value=lambda comment: comment.author.username
+    ),
+}
+
+CATEGORY_FIELDS = {
+    'id': Field('id'),
+    'slug': Field('slug'),
+    'title': Field('title'),
+    'description': Field('description'),
+}
+
+LOCATION_FIELDS = {
+    'id': Field('id'),
+    'name': Field('name'),
+}
+
+
+def api_view(view):
+    """Allow only safe methods and render errors as JSON."""
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except Http404 as error:
+            return JsonResponse(
+                {'error': str(error) or 'Не найдено'}, status=404
+            )
+        except ApiError as error:
+            return JsonResponse({'error': error.message}, status=error.status)
+    return wrapper
+
+
+def requested_fields(request, spec, default=None):
+    """Return the field names listed in ``?fields=``, checked against spec."""
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(default or spec)
+    names = list(dict.fromkeys(
+        name.strip() for name in raw.split(',') if name.strip()
+    ))
+    unknown = [name for name in names if name not in spec]
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(unknown)}')
+    return names
+
+
+def restrict(queryset, spec, names, required=('id',)):
+    """Load only the columns and relations the requested fields need."""
+    columns, related = set(required), set()
+    for name in names:
+        columns.update(spec[name].columns)
+        if spec[name].related:
+            related.add(spec[name].related)
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
+
+
+def serialize(obj, spec, names):
+    return {name: spec[name].serialize(obj, name) for name in names}
+
+
+def dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def page_size(request):
+    raw = request.GET.get('limit')
+    if raw is None:
+        return settings.API_PAGE_SIZE
+    try:
+        size = int(raw)
+    except ValueError:
+        size = 0
+    if not 1 <= size <= settings.API_MAX_PAGE_SIZE:
+        raise ApiError(
+            f'Параметр limit должен быть от 1 до '
+            f'{settings.API_MAX_PAGE_SIZE}.'
+        )
+    return size
+
+
+def stream_page(request, queryset, spec, ordering, default_fields=None):
+    """Stream one keyset page of the queryset as a JSON document."""
+    names = requested_fields(request, spec, default_fields)
+    required = ('id', *(field.lstrip('-') for field in ordering))
+    paginator = KeysetPaginator(
+        restrict(queryset, spec, names, required),
+        page_size(request),
+        ordering=ordering
+    )
+    page = paginator.page(request.GET.get('cursor'))
+
+    def chunks():
+        yield '{"results": ['
+        for index, obj in enumerate(page):
+            yield (',' if index else '') + dumps(serialize(obj, spec, names))
+        yield (
+            f'], "next": {dumps(page.next_cursor)}, '
+            f'"previous": {dumps(page.previous_cursor)}}}'
+        )
+
+    return StreamingHttpResponse(chunks(), content_type='application/json')
+
+
+def visible_posts(request):
+    """Published posts plus every post of the current user."""
+    return get_post_queryset(apply_filters=True) | get_post_queryset().filter(
+        author_id=request.user.id
+    )
+
+
+@api_view
+def posts(request):
+    return stream_page(
+        request, get_post_queryset(apply_filters=True), POST_FIELDS,
+        ('-pub_date', '-id'), POST_DEFAULT_FIELDS
+    )
+
+
+@api_view
+def category_posts(request, category_slug):
+    category = get_published_category(category_slug)
+    return stream_page(
+        request,
+        get_post_queryset(apply_filters=True).filter(category=category),
+        POST_FIELDS, ('-pub_date', '-id'), POST_DEFAULT_FIELDS
+    )
+
+
+@api_view
+def profile_posts(request, username):
+    profile = get_object_or_404(User.objects.only('id'), username=username)
+    queryset = get_post_queryset(
+        apply_filters=request.user.id != profile.id
+    ).filter(author=profile)
+    return stream_page(
+        request, queryset, POST_FIELDS, ('-pub_date', '-id'),
+        POST_DEFAULT_FIELDS
+    )
+
+
+@api_view
+def post_detail(request, post_id):
+    names = requested_fields(request, POST_FIELDS)
+    post = get_object_or_404(
+        restrict(visible_posts(request), POST_FIELDS, names), pk=post_id
+    )
+    return JsonResponse(
+        serialize(post, POST_FIELDS, names),
+        json_dumps_params={'ensure_ascii': False}
+    )
+
+
+@api_view
+def post_comments(request, post_id):
+    if not visible_posts(request).filter(pk=post_id).exists():
+        raise Http404('Пост недоступен')
+    return stream_page(
+        request, Comment.objects.filter(post_id=post_id), COMMENT_FIELDS,
+        ('created_at', 'id')
+    )
+
+
+@api_view
+def categories(request):
+    return stream_page(
+        request, Category.objects.filter(is_published=True),
+        CATEGORY_FIELDS, ('id',)
+    )
+
+
+@api_view
+def locations(request):
+    return stream_page(
+        request, Location.objects.filter(is_published=True),
+        LOCATION_FIELDS, ('id',)
+    )
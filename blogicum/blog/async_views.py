@@ -0,0 +1,117 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.shortcuts import aget_object_or_404
+from django.views.generic import View
+
+from core.routers import replica_reads
+from . import views
+from .cache import category_summary
+from .forms import CommentForm
+from .lookups import lookup_tables
+from .mixins import AnonymousFeedCacheMixin, revalidate
+from .pagination import KeysetPaginator
+
+
+class AsyncReadMixin:
+    """
+    Mixin to serve a read view as a coroutine.
+
+    Replaces the synchronous dispatch chain of the view it is mixed into:
+    the context is fetched with the async ORM, while the page cache,
+    replica routing and conditional GET behave as in the sync view.
+    """
+
+    async def aget_context_data(self):
+        """Page of ``get_queryset()``; it must not query the database."""
+        return await self.apaginate(self.get_queryset())
+
+    async def apaginate(self, queryset):
+        paginator = KeysetPaginator(
+            queryset, self.paginate_by, ordering=self.keyset_ordering
+        )
+        page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+        self.object_list = page.object_list
+        return {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'object_list': page.object_list,
+            'view': self,
+        }
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        key = None
+        if isinstance(self, AnonymousFeedCacheMixin):
+            key = self.get_feed_cache_key(request)
+            if key is not None:
+                response = await cache.aget(key)
+                if response is not None:
+                    return revalidate(request, response)
+
+        if self.reads_from_replica(request):
+            with replica_reads():
+                response = await View.dispatch(self, request, *args, **kwargs)
+        else:
+            response = await View.dispatch(self, request, *args, **kwargs)
+
+        if key is not None:
+            self.cache_feed_page(key, response)
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        await sync_to_async(lookup_tables.refresh)()
+        response = self.render_to_response(await self.aget_context_data())
+        if hasattr(response, 'render'):
+            await sync_to_async(response.render)()
+        return response
+
+
+class IndexView(AsyncReadMixin, views.IndexView):
+    async def aget_context_data(self):
+        context = await super().aget_context_data()
+        context['category_summary'] = await sync_to_async(
+            category_summary
+        )()
+        return context
+
+
+class CategoryPostView(AsyncReadMixin, views.CategoryPostView):
+    async def aget_context_data(self):
+        context = await super().aget_context_data()
+        context['category'] = self.get_category()
+        return context
+
+
+class UserProfileView(AsyncReadMixin, views.UserProfileView):
+    async def aget_context_data(self):
+        profile = await aget_object_or_404(
+            views.get_profiles(), username=self.kwargs['username']
+        )
+        context = await self.apaginate(
+            views.get_post_queryset(
+                apply_filters=self.request.user != profile
+            ).filter(author=profile)
+        )
+        context['profile'] = profile
+        context['stats'] = views.get_author_stats(profile)
+        return context
+
+
+class PostDetailView(AsyncReadMixin, views.PostDetailView):
+    async def aget_context_data(self):
+        post = await aget_object_or_404(
+            views.get_post_queryset(), pk=self.kwargs['post_id']
+        )
+        views.check_post_visible(self.request, post)
+        self.object = post
+        comments = await views.get_comments_paginator(post).apage(
+            self.request.GET.get('cursor')
+        )
+        return {
+            'object': post,
+            'post': post,
+            'comments': comments,
+            'form': CommentForm(),
+            'view': self,
+        }
@@ -0,0 +1,119 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .lookups import lookup_tables, versions_cache
+from .models import CategoryStats, Post
+
+GLOBAL_SCOPE = 'all'
+INDEX_SCOPE = 'index'
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def profile_scope(username):
+    return f'profile:{username}'
+
+
+def feed_scope(category_slug=None, username=None, **kwargs):
+    """Return the scope of a feed page from its URL arguments."""
+    if category_slug is not None:
+        return category_scope(category_slug)
+    if username is not None:
+        return profile_scope(username)
+    return INDEX_SCOPE
+
+
+def post_feed_scopes(*post_ids):
+    """Return the feed cache scopes the given posts are shown in."""
+    scopes = {INDEX_SCOPE}
+    for slug, username in Post.objects.filter(pk__in=post_ids).values_list(
+        'category__slug', 'author__username'
+    ):
+        if slug:
+            scopes.add(category_scope(slug))
+        scopes.add(profile_scope(username))
+    return scopes
+
+
+def _version_key(scope):
+    return f'feed-version:{scope}'
+
+
+def feed_versions(*scopes):
+    """Return the current version token of every scope."""
+    keys = [_version_key(scope) for scope in (GLOBAL_SCOPE, *scopes)]
+    versions = versions_cache.get_many(keys)
+    return [versions.get(key, 0) for key in keys]
+
+
+def _bump(scopes):
+    token = time.time_ns()
+    versions_cache.set_many(
+        {_version_key(scope): token for scope in scopes}, timeout=None
+    )
+
+
+def invalidate_feeds(*scopes):
+    """
+    Invalidate cached feed pages of the given scopes.
+
+    Versions are bumped right away and once more after the surrounding
+    transaction commits, so a page rendered from not yet committed data
+    in between is not kept either. They live in the versions cache, so
+    other processes only see the bump if that cache is shared between
+    them (check blog.W001).
+    """
+    scopes = tuple(scopes) or (GLOBAL_SCOPE,)
+    _bump(scopes)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(scopes))
+
+
+def feed_page_key(view_name, scope, request):
+    """Build the cache key of one rendered feed page."""
+    query = request.GET.urlencode()
+    raw = ':'.join(str(part) for part in (
+        view_name, scope, query, *feed_versions(scope),
+    ))
+    return f'feed-page:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def category_summary():
+    """
+    Published categories with their post counter and latest post.
+
+    Read from ``CategoryStats`` and cached like the index page: the key
+    follows the index feed version, so a write to any post or category,
+    or a scheduled post going public, rebuilds it. Titles and slugs come
+    from the lookup tables.
+    """
+    version = ':'.join(str(part) for part in feed_versions(INDEX_SCOPE))
+    key = f'category-summary:{hashlib.md5(version.encode()).hexdigest()}'
+    summary = cache.get(key)
+    if summary is not None:
+        return summary
+
+    summary = []
+    for row in CategoryStats.objects.filter(post_count__gt=0).values(
+        'category_id', 'post_count',
+        latest_id=F('latest_post'), latest_title=F('latest_post__title'),
+    ):
+        category = lookup_tables.category(row['category_id'])
+        if category and category.is_published:
+            summary.append({
+                'slug': category.slug,
+                'title': category.title,
+                'post_count': row['post_count'],
+                'latest_id': row['latest_id'],
+                'latest_title': row['latest_title'],
+            })
+    summary.sort(key=lambda row: row['title'])
+    cache.set(key, summary, settings.FEED_CACHE_TIMEOUT)
+    return summary
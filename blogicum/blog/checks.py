@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+from .lookups import VERSIONS_CACHE
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Feed and lookup table invalidation needs a cache shared by processes."""
+    if VERSIONS_CACHE not in settings.CACHES:
+        return [Error(
+            f'CACHES has no "{VERSIONS_CACHE}" alias.',
+            hint=(
+                'Feed and lookup table version tokens are kept in a cache '
+                'of their own that never evicts them.'
+            ),
+            id='blog.E001',
+        )]
+    backend = settings.CACHES[VERSIONS_CACHE].get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'The "{VERSIONS_CACHE}" cache is local to each process.',
+        hint=(
+            'Feed pages and lookup tables are invalidated through the '
+            f'"{VERSIONS_CACHE}" cache; use a backend shared by the web '
+            'workers, runworker and activate_scheduled, e.g. FileBasedCache, '
+            'Redis or Memcached.'
+        ),
+        id='blog.W001',
+    )]
@@ -0,0 +1,142 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import quote_etag
+
+from .cache import feed_page_key, feed_scope
+from .mixins import revalidate
+from .views import get_post_queryset, get_published_category
+
+
+class CachedFeed(Feed):
+    """
+    Feed cached under the version of its feed scope.
+
+    The cached document is dropped as soon as a post of the scope is
+    published, changed or hidden; its ETag is the hash of the content,
+    so polls get 304 Not Modified until the feed really changes.
+
+    The document is rebuilt whole rather than patched entry by entry: it
+    holds at most ``SYNDICATION_FEED_SIZE`` posts read with one indexed
+    query, so a rebuild per scope bump costs about as much as finding the
+    entries to patch would, and readers polling in between hit the cache.
+    """
+
+    def get_cache_scope(self, **kwargs):
+        """Scope of the feed, from the category or author in the URL."""
+        return feed_scope(**kwargs)
+
+    def __call__(self, request, *args, **kwargs):
+        key = feed_page_key(
+            request.resolver_match.view_name,
+            self.get_cache_scope(**kwargs),
+            request
+        )
+        response = cache.get(key)
+        if response is None:
+            response = super().__call__(request, *args, **kwargs)
+            response.headers['ETag'] = quote_etag(
+                hashlib.md5(response.content).hexdigest()
+            )
+            cache.set(key, response, settings.FEED_CACHE_TIMEOUT)
+        return revalidate(request, response)
+
+
+class PostsFeed(CachedFeed):
+    """RSS feed of the latest published posts."""
+
+    title = 'Блогикум'
+    description = 'Новые публикации'
+
+    def link(self, obj):
+        return reverse('blog:index')
+
+    def get_queryset(self, obj):
+        return get_post_queryset(apply_filters=True)
+
+    def items(self, obj):
+        return self.get_queryset(obj)[:settings.SYNDICATION_FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=(item.id,))
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_categories(self, item):
+        return (item.category.title,) if item.category else ()
+
+
+class CategoryFeed(PostsFeed):
+    """RSS feed of the latest posts in a category."""
+
+    def get_object(self, request, category_slug):
+        return get_published_category(category_slug)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+    def get_queryset(self, obj):
+        return get_post_queryset(apply_filters=True).filter(category=obj)
+
+
+class AuthorFeed(PostsFeed):
+    """RSS feed of the latest posts by an author."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: публикации {obj.username}'
+
+    def description(self, obj):
+        return f'Новые публикации пользователя {obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=(obj.username,))
+
+    def get_queryset(self, obj):
+        return get_post_queryset(apply_filters=True).filter(author=obj)
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class AtomCategoryFeed(CategoryFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AtomAuthorFeed(AuthorFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
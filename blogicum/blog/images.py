@@ -0,0 +1,90 @@
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.timezone import now
+from PIL import Image, ImageOps
+
+DERIVATIVE_FORMATS = (
+    ('webp', 'WEBP', 'image/webp'),
+    ('jpg', 'JPEG', 'image/jpeg'),
+)
+
+
+def derivative_name(source_name, width, extension):
+    directory, filename = posixpath.split(source_name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'derivatives', f'{stem}_{width}w.{extension}'
+    )
+
+
+def build_derivatives(image):
+    """Save resized WebP/JPEG copies of an image next to the original."""
+    with image.open('rb'):
+        source = ImageOps.exif_transpose(Image.open(image))
+        source.load()
+    width, height = source.size
+    widths = [w for w in settings.POST_IMAGE_WIDTHS if w < width] or [width]
+
+    variants = []
+    for target_width in widths:
+        target_height = max(1, round(height * target_width / width))
+        resized = source.resize(
+            (target_width, target_height), Image.Resampling.LANCZOS
+        )
+        for extension, pil_format, mime_type in DERIVATIVE_FORMATS:
+            if pil_format == 'JPEG' and resized.mode != 'RGB':
+                encoded_image = resized.convert('RGB')
+            else:
+                encoded_image = resized
+            buffer = BytesIO()
+            encoded_image.save(
+                buffer, pil_format,
+                quality=settings.POST_IMAGE_QUALITY, optimize=True
+            )
+            name = image.storage.save(
+                derivative_name(image.name, target_width, extension),
+                ContentFile(buffer.getvalue())
+            )
+            variants.append({
+                'name': name,
+                'width': target_width,
+                'height': target_height,
+                'type': mime_type,
+            })
+    return {
+        'source': image.name,
+        'width': width,
+        'height': height,
+        'variants': variants,
+    }
+
+
+def delete_derivatives(image_variants, storage):
+    for variant in image_variants.get('variants', ()):
+        storage.delete(variant['name'])
+
+
+def derivatives_outdated(post):
+    source = post.image.name if post.image else None
+    return post.image_variants.get('source') != source
+
+
+def update_post_derivatives(post):
+    """Regenerate the derivatives of a post if its image has changed."""
+    if not derivatives_outdated(post):
+        return
+    source = post.image.name if post.image else None
+    delete_derivatives(post.image_variants, post.image.storage)
+    post.image_variants = {}
+    if source:
+        try:
+            post.image_variants = build_derivatives(post.image)
+        except OSError:
+            # Unreadable upload: keep serving the original file.
+            post.image_variants = {'source': source, 'variants': []}
+    type(post).objects.filter(pk=post.pk).update(
+        image_variants=post.image_variants, updated_at=now()
+    )
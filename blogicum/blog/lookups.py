@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import request_started
+from django.db import transaction
+from django.utils.connection import ConnectionProxy
+
+VERSION_KEY = 'lookup-tables-version'
+
+# Version tokens are kept apart from cached pages, so culling the page
+# cache never drops them.
+VERSIONS_CACHE = 'versions'
+versions_cache = ConnectionProxy(caches, VERSIONS_CACHE)
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class LookupTables:
+    """
+    In-process copy of the small Category and Location tables.
+
+    Each process keeps its own copy and compares it with a version token
+    in the versions cache once per request, and at least every
+    ``LOOKUP_TABLES_MAX_AGE`` seconds in processes that serve no requests
+    (runworker, management commands). Saving or deleting a row bumps the
+    token, so the other processes reload as long as they share that cache
+    (check blog.W001). Async code never queries here: it calls
+    ``refresh()`` through ``sync_to_async`` first and otherwise reads the
+    current copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = None
+        self._tables = {}, {}, {}
+
+    def _load(self):
+        Category = apps.get_model('blog', 'Category')
+        Location = apps.get_model('blog', 'Location')
+        categories = {obj.pk: obj for obj in Category.objects.all()}
+        by_slug = {obj.slug: obj for obj in categories.values()}
+        locations = {obj.pk: obj for obj in Location.objects.all()}
+        self._tables = categories, by_slug, locations
+
+    def _current_version(self):
+        version = versions_cache.get(VERSION_KEY)
+        if version is None:
+            versions_cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+            version = versions_cache.get(VERSION_KEY)
+        return version
+
+    def _is_checked(self):
+        return self._checked_at is not None and (
+            time.monotonic() - self._checked_at
+            < settings.LOOKUP_TABLES_MAX_AGE
+        )
+
+    def _fresh_tables(self):
+        if not self._is_checked() and not _in_event_loop():
+            with self._lock:
+                version = self._current_version()
+                if version != self._version:
+                    self._load()
+                    self._version = version
+                self._checked_at = time.monotonic()
+        return self._tables
+
+    def refresh(self):
+        """Reload the tables now if another process has changed them."""
+        self._fresh_tables()
+
+    def expire(self, **kwargs):
+        """Compare with the shared version again on the next access."""
+        self._checked_at = None
+
+    def invalidate(self):
+        """Make every process reload the tables, this one included."""
+        def bump():
+            versions_cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+            self._version = None
+            self._checked_at = None
+
+        bump()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(bump)
+
+    def category(self, pk):
+        return self._fresh_tables()[0].get(pk)
+
+    def category_by_slug(self, slug):
+        return self._fresh_tables()[1].get(slug)
+
+    def location(self, pk):
+        return self._fresh_tables()[2].get(pk)
+
+    def unpublished_category_ids(self):
+        return [
+            pk for pk, category in self._fresh_tables()[0].items()
+            if not category.is_published
+        ]
+
+    def attach(self, post):
+        """Set the category and location of a post from the tables."""
+        categories, _, locations = self._fresh_tables()
+        for name, table in (
+            ('category', categories), ('location', locations)
+        ):
+            field = post._meta.get_field(name)
+            pk = post.__dict__.get(field.attname)
+            if pk is not None and pk in table:
+                field.set_cached_value(post, table[pk])
+
+
+lookup_tables = LookupTables()
+request_started.connect(lookup_tables.expire)
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from blog.scheduling import activate_scheduled_posts, next_activation
+
+
+class Command(BaseCommand):
+    help = 'Показывает в лентах отложенные публикации, дата которых наступила.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help='Проверять с этим интервалом, в секундах; к дате ближайшей '
+                 'отложенной публикации команда просыпается раньше.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            activated = activate_scheduled_posts()
+            if activated:
+                self.stdout.write(
+                    f'Показаны отложенные публикации: {len(activated)}.'
+                )
+            if options['interval'] is None:
+                break
+            time.sleep(self.delay(options['interval']))
+
+    def delay(self, interval):
+        upcoming = next_activation()
+        if upcoming is None:
+            return interval
+        return min(interval, max((upcoming - now()).total_seconds(), 0))
@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from blog.transfer import export_records
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает пользователей, категории, местоположения, публикации '
+        'и комментарии в формате JSON Lines.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Файл для выгрузки, «-» — стандартный вывод.'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        def progress(label, count):
+            self.stderr.write(f'{label}: выгружено {count}')
+
+        if options['path'] == '-':
+            export_records(sys.stdout, options['batch_size'], progress)
+            return
+        with open(options['path'], 'w', encoding='utf-8') as stream:
+            export_records(stream, options['batch_size'], progress)
@@ -0,0 +1,70 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from blog.transfer import (
+    TRANSFER_MODELS, Importer, TransferError, model_label
+)
+
+
+def legacy_fixture_lines(text):
+    """Yield the records of a JSON array fixture such as db.json."""
+    order = {model_label(model): i for i, model in enumerate(TRANSFER_MODELS)}
+    records = sorted(
+        json.loads(text), key=lambda record: order.get(record['model'], -1)
+    )
+    for record in records:
+        yield json.dumps(record)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает данные блога из JSON Lines пакетами bulk_create. '
+        'Файл-массив вроде db.json тоже принимается, но читается целиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Файл для загрузки, «-» — стандартный ввод.'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--keep-ids', action='store_true',
+            help='Сохранить первичные ключи из файла (для пустой базы).'
+        )
+
+    def handle(self, *args, **options):
+        def progress(label, count):
+            self.stderr.write(f'{label}: загружено {count}')
+
+        importer = Importer(
+            options['batch_size'], options['keep_ids'], progress
+        )
+        if options['path'] == '-':
+            imported = self.load(importer, sys.stdin)
+        else:
+            with open(options['path'], encoding='utf-8') as stream:
+                imported = self.load(importer, stream)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено записей: {sum(imported.values())}, '
+            f'пропущено записей других моделей: {importer.skipped}.'
+        ))
+
+    def load(self, importer, stream):
+        first = stream.read(1)
+        while first.isspace():
+            first = stream.read(1)
+        if first == '[':
+            lines = legacy_fixture_lines(first + stream.read())
+        else:
+            lines = self.prepend(first, stream)
+        try:
+            return importer.load(lines)
+        except (TransferError, IntegrityError) as error:
+            raise CommandError(f'Загрузка прервана: {error}')
+
+    def prepend(self, first, stream):
+        yield first + stream.readline()
+        yield from stream
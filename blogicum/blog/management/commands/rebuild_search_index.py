@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.search import rebuild_index, search_available
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций.'
+
+    def handle(self, *args, **options):
+        if not search_available():
+            self.stdout.write(
+                'Полнотекстовый индекс недоступен, поиск работает без него.'
+            )
+            return
+        indexed = rebuild_index(Post.objects.all())
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано публикаций: {indexed}.'
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import AuthorStats, CategoryStats, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованные счётчики публикаций.'
+
+    def handle(self, *args, **options):
+        updated = Post.objects.update_comment_count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Счётчики комментариев пересчитаны: {updated} публикаций.'
+        ))
+        updated = AuthorStats.objects.recount()
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика авторов пересчитана: {updated} авторов.'
+        ))
+        updated = CategoryStats.objects.recount()
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика категорий пересчитана: {updated} категорий.'
+        ))
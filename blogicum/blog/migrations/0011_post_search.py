@@ -0,0 +1,69 @@
+import re
+
+import snowballstemmer
+from django.db import OperationalError, migrations
+
+# A snapshot of blog.search as of this migration: later changes to the
+# live module must not change what this migration does.
+SEARCH_TABLE = 'blog_post_search'
+WORD_RE = re.compile(r'\w+')
+BATCH_SIZE = 2000
+
+
+def stemmed(stemmer, text):
+    words = WORD_RE.findall(text.lower().replace('ё', 'е'))
+    return ' '.join(stemmer.stemWords(words))
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} '
+                f'USING fts5(title, text)'
+            )
+    except OperationalError:
+        # SQLite built without FTS5: search falls back to LIKE.
+        return
+
+    Post = apps.get_model('blog', 'Post')
+    stemmer = snowballstemmer.stemmer('russian')
+    rows = Post.objects.using(connection.alias).order_by().values_list(
+        'id', 'title', 'text'
+    ).iterator(chunk_size=BATCH_SIZE)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        batch = []
+        for pk, title, text in rows:
+            batch.append((pk, stemmed(stemmer, title), stemmed(stemmer, text)))
+            if len(batch) == BATCH_SIZE:
+                cursor.executemany(
+                    f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+                    f'VALUES (%s, %s, %s)', batch
+                )
+                batch = []
+        if batch:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+                f'VALUES (%s, %s, %s)', batch
+            )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_admin_date_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationAction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('publish', 'Опубликовано'), ('unpublish', 'Снято с публикации'), ('move', 'Перенесено в категорию'), ('delete', 'Удалено')], max_length=16, verbose_name='Действие')),
+                ('target', models.CharField(max_length=64, verbose_name='Модель')),
+                ('object_ids', models.JSONField(default=list, verbose_name='Идентификаторы объектов')),
+                ('object_count', models.PositiveIntegerField(verbose_name='Количество объектов')),
+                ('details', models.JSONField(blank=True, default=dict, verbose_name='Подробности')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата')),
+                ('moderator', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='moderation_actions', to=settings.AUTH_USER_MODEL, verbose_name='Модератор')),
+            ],
+            options={
+                'verbose_name': 'действие модератора',
+                'verbose_name_plural': 'Действия модераторов',
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
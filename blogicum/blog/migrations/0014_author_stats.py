@@ -0,0 +1,56 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def fill_author_stats(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    stats = {}
+    for row in Post.objects.using(alias).order_by().values('author').annotate(
+        post_count=Count('pk'),
+        published_count=Count('pk', filter=Q(is_published=True)),
+        last_post_at=Max('created_at'),
+    ):
+        stats[row.pop('author')] = row
+    for row in Comment.objects.using(alias).order_by().values(
+        'post__author'
+    ).annotate(total=Count('pk')):
+        stats.setdefault(row['post__author'], {})['comments_received'] = (
+            row['total']
+        )
+    AuthorStats.objects.using(alias).bulk_create(
+        [AuthorStats(author_id=pk, **values) for pk, values in stats.items()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0013_moderation_action'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('published_count', models.PositiveIntegerField(default=0, verbose_name='Опубликовано')),
+                ('comments_received', models.PositiveIntegerField(default=0, verbose_name='Комментариев к публикациям')),
+                ('last_post_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
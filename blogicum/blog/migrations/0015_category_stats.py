@@ -0,0 +1,62 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Min, Q
+from django.utils.timezone import now
+
+
+def fill_category_stats(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Post = apps.get_model('blog', 'Post')
+    CategoryStats = apps.get_model('blog', 'CategoryStats')
+    cutoff = now()
+    published = Post.objects.using(alias).filter(
+        is_published=True, category__isnull=False
+    ).order_by()
+    stats = {
+        row['category']: CategoryStats(
+            category_id=row['category'],
+            post_count=row['post_count'],
+            next_pub_date=row['next_pub_date'],
+        )
+        for row in published.values('category').annotate(
+            post_count=Count('pk', filter=Q(pub_date__lte=cutoff)),
+            next_pub_date=Min('pub_date', filter=Q(pub_date__gt=cutoff)),
+        )
+    }
+    for category_id, post_id in published.filter(
+        pub_date__lte=cutoff
+    ).order_by('category', '-pub_date', '-id').values_list(
+        'category', 'pk'
+    ):
+        if stats[category_id].latest_post_id is None:
+            stats[category_id].latest_post_id = post_id
+    CategoryStats.objects.using(alias).bulk_create(
+        stats.values(), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_author_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='blog.category', verbose_name='Категория')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('next_pub_date', models.DateTimeField(blank=True, null=True, verbose_name='Ближайшая отложенная публикация')),
+                ('latest_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.post', verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика категории',
+                'verbose_name_plural': 'Статистика категорий',
+                'indexes': [models.Index(condition=models.Q(('next_pub_date__isnull', False)), fields=['next_pub_date'], name='category_stats_due_idx')],
+            },
+        ),
+        migrations.RunPython(fill_category_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-17 08:07
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def fill_visible_stats(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    stats = {}
+    for row in Post.objects.using(alias).filter(
+        is_visible=True
+    ).order_by().values('author').annotate(
+        visible_count=Count('pk'), last_visible_at=Max('pub_date')
+    ):
+        stats[row.pop('author')] = row
+    for row in Comment.objects.using(alias).filter(
+        post__is_visible=True
+    ).order_by().values('post__author').annotate(total=Count('pk')):
+        stats.setdefault(row['post__author'], {})['visible_comments'] = (
+            row['total']
+        )
+    for pk, values in stats.items():
+        AuthorStats.objects.using(alias).filter(author_id=pk).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_comment_post_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='authorstats',
+            name='last_visible_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата последней публикации в лентах'),
+        ),
+        migrations.AddField(
+            model_name='authorstats',
+            name='visible_comments',
+            field=models.PositiveIntegerField(default=0, verbose_name='Комментариев к публикациям в лентах'),
+        ),
+        migrations.AddField(
+            model_name='authorstats',
+            name='visible_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Публикаций в лентах'),
+        ),
+        migrations.RunPython(fill_visible_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-17 08:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_author_stats_visible'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='categorystats',
+            name='category_stats_due_idx',
+        ),
+        migrations.RemoveField(
+            model_name='categorystats',
+            name='next_pub_date',
+        ),
+    ]
@@ -1,14 +1,169 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 
 from django.contrib.auth.mixins import UserPassesTestMixin
 
+from core.middleware import SAFE_METHODS
+from core.routers import replica_reads
+from .cache import feed_page_key, feed_scope
+from .pagination import KeysetPaginator
+from .utils import memoize_per_request
+
+
+def revalidate(request, response):
+    """Answer a stored response with 304 if the client still has it."""
+    return get_conditional_response(
+        request,
+        etag=response.get('ETag'),
+        last_modified=parse_http_date_safe(
+            response.get('Last-Modified', '')
+        ),
+        response=response
+    )
+
 
 class AuthorPermissionMixin(UserPassesTestMixin):
     """Mixin to check if the user is the author of the post."""
 
+    @memoize_per_request
+    def get_object(self, queryset=None):
+        return super().get_object(queryset)
+
     def test_func(self):
         post = self.get_object()
-        return post.author == self.request.user
+        return post.author_id == self.request.user.id
 
     def handle_no_permission(self):
         return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
+
+
+class KeysetPaginationMixin:
+    """Mixin to paginate a ListView by cursor instead of page number."""
+
+    keyset_ordering = ('-pub_date', '-id')
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset, page_size, ordering=self.keyset_ordering
+        )
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class ConditionalGetMixin:
+    """
+    Mixin to answer repeat GET requests with 304 Not Modified.
+
+    Validators are computed from the objects already fetched for the
+    context, so an unchanged page is never rendered.
+    """
+
+    def get_validators(self, context):
+        """Return the values the page depends on and its change times."""
+        page = context['page_obj']
+        parts, timestamps = [page.has_next()], []
+        for post in page:
+            parts.extend((post.id, post.card_version))
+            timestamps.extend((post.updated_at, post.pub_date))
+        return parts, timestamps
+
+    def get_client_validators(self):
+        """
+        Return what the page of a signed-in user depends on besides data.
+
+        Such pages embed the CSRF token in their forms, and logging in
+        rotates it: a page kept from before the login would be answered
+        with 403 on its next POST.
+        """
+        user = self.request.user
+        if not user.is_authenticated:
+            return [None], []
+        get_token(self.request)
+        timestamps = [user.last_login] if user.last_login else []
+        return [user.pk, self.request.META['CSRF_COOKIE']], timestamps
+
+    def render_to_response(self, context, **response_kwargs):
+        parts, timestamps = self.get_validators(context)
+        client_parts, client_timestamps = self.get_client_validators()
+        parts = [*client_parts, *parts]
+        timestamps = [*timestamps, *client_timestamps]
+        raw = ':'.join(str(part) for part in parts)
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        last_modified = max(timestamps, default=None)
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().render_to_response(context, **response_kwargs)
+        response.headers['ETag'] = etag
+        if last_modified is not None:
+            response.headers['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class AnonymousFeedCacheMixin:
+    """Mixin to serve anonymous GET requests from the feed page cache."""
+
+    def get_feed_cache_scope(self):
+        """Scope of the page, from the category or author in the URL."""
+        return feed_scope(**self.kwargs)
+
+    def get_feed_cache_key(self, request):
+        """Return the page cache key, or None if the page is not cached."""
+        if request.method != 'GET' or request.user.is_authenticated:
+            return None
+        return feed_page_key(
+            request.resolver_match.view_name,
+            self.get_feed_cache_scope(),
+            request
+        )
+
+    def cache_feed_page(self, key, response):
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key, rendered, settings.FEED_CACHE_TIMEOUT
+                )
+            )
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        key = self.get_feed_cache_key(request)
+        if key is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        response = cache.get(key)
+        if response is not None:
+            return revalidate(request, response)
+        return self.cache_feed_page(
+            key, super().dispatch(request, *args, **kwargs)
+        )
+
+
+class ReplicaReadMixin:
+    """Mixin to serve safe requests of a read-mostly view from a replica."""
+
+    def reads_from_replica(self, request):
+        return request.method in SAFE_METHODS and not getattr(
+            request, 'pinned_to_primary', False
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.reads_from_replica(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        with replica_reads():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        return response
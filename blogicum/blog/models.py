@@ -1,13 +1,40 @@
 from django.db import models
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.query import ModelIterable
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 
 from core.models import BaseModel
+from .lookups import lookup_tables
 
 User = get_user_model()
 
 MAX_LENGTH = 256
 
 
+class LookupModelIterable(ModelIterable):
+    """Yield posts with category and location taken from lookup tables."""
+
+    def __iter__(self):
+        for post in super().__iter__():
+            lookup_tables.attach(post)
+            yield post
+
+
+class PostQuerySet(models.QuerySet):
+    def with_lookups(self):
+        """Attach categories and locations without joining their tables."""
+        clone = self._chain()
+        clone._iterable_class = LookupModelIterable
+        return clone
+
+    def update_comment_count(self):
+        """Recompute the stored comment counter with one UPDATE."""
+        counts = Comment.objects.filter(post=OuterRef('pk')).order_by(
+        ).values('post').annotate(total=Count('pk')).values('total')
+        return self.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
 class Post(BaseModel):
     title = models.CharField(
         max_length=MAX_LENGTH, verbose_name='Заголовок')
@@ -40,15 +67,88 @@ class Post(BaseModel):
         null=True,
         verbose_name='Изображение'
     )
+    image_variants = models.JSONField(
+        default=dict, blank=True, editable=False,
+        verbose_name='Производные изображения'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False,
+        verbose_name='Количество комментариев'
+    )
+    is_visible = models.BooleanField(
+        default=False, editable=False,
+        verbose_name='Показывается в лентах',
+        help_text='Опубликовано и дата публикации наступила.'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_published_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_published=True, is_visible=False),
+                name='post_scheduled_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Save the post without writing back ``comment_count``.
+
+        The counter is only changed with ``F()`` updates by the comment
+        signals; a full save of a post loaded earlier would overwrite the
+        increments made since.
+        """
+        if (
+            not self._state.adding and self.pk is not None
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name != 'comment_count'
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def card_version(self):
+        """Stamp of everything rendered on the post card."""
+        return ':'.join(str(part) for part in (
+            self.updated_at.timestamp(),
+            self.comment_count,
+            self.author.username,
+            self.category and self.category.updated_at.timestamp(),
+            self.location and self.location.updated_at.timestamp(),
+        ))
+
 
 class Category(BaseModel):
     title = models.CharField(
@@ -104,8 +204,260 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('created_at', 'id'),
+                name='comment_created_idx',
+            ),
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx',
+            ),
+        )
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return f'Комментарий от {self.author}'
+
+
+class ModerationAction(models.Model):
+    """Audit record of one bulk action taken in the admin."""
+
+    PUBLISH = 'publish'
+    UNPUBLISH = 'unpublish'
+    MOVE = 'move'
+    DELETE = 'delete'
+    ACTION_CHOICES = (
+        (PUBLISH, 'Опубликовано'),
+        (UNPUBLISH, 'Снято с публикации'),
+        (MOVE, 'Перенесено в категорию'),
+        (DELETE, 'Удалено'),
+    )
+
+    moderator = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True,
+        related_name='moderation_actions',
+        verbose_name='Модератор'
+    )
+    action = models.CharField(
+        max_length=16, choices=ACTION_CHOICES, verbose_name='Действие'
+    )
+    target = models.CharField(max_length=64, verbose_name='Модель')
+    object_ids = models.JSONField(
+        default=list, verbose_name='Идентификаторы объектов'
+    )
+    object_count = models.PositiveIntegerField(
+        verbose_name='Количество объектов'
+    )
+    details = models.JSONField(
+        default=dict, blank=True, verbose_name='Подробности'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Дата'
+    )
+
+    class Meta:
+        ordering = ('-created_at',)
+        verbose_name = 'действие модератора'
+        verbose_name_plural = 'Действия модераторов'
+
+    def __str__(self):
+        return (
+            f'{self.get_action_display()}: {self.target} '
+            f'({self.object_count})'
+        )
+
+
+class StatsQuerySet(models.QuerySet):
+    def ensure(self, keys):
+        """Create the missing rows for the given primary keys."""
+        attname = self.model._meta.pk.attname
+        self.bulk_create(
+            [self.model(**{attname: key}) for key in set(keys)],
+            ignore_conflicts=True
+        )
+
+
+class AuthorStatsQuerySet(StatsQuerySet):
+
+    def add_post(self, post):
+        self.ensure([post.author_id])
+        rows = self.filter(pk=post.author_id)
+        rows.update(
+            post_count=F('post_count') + 1,
+            published_count=F('published_count') + int(post.is_published),
+            visible_count=F('visible_count') + int(post.is_visible),
+            last_post_at=post.created_at,
+        )
+        if post.is_visible:
+            rows.filter(
+                Q(last_visible_at__isnull=True)
+                | Q(last_visible_at__lt=post.pub_date)
+            ).update(last_visible_at=post.pub_date)
+
+    def add_comments(self, post_id, delta):
+        """Change the received comments of the author of a post."""
+        rows = self.filter(author__posts=post_id)
+        if delta < 0:
+            rows = rows.filter(comments_received__gte=-delta)
+        rows.update(comments_received=F('comments_received') + delta)
+        visible = self.filter(
+            author__posts=post_id, author__posts__is_visible=True
+        )
+        if delta < 0:
+            visible = visible.filter(visible_comments__gte=-delta)
+        visible.update(visible_comments=F('visible_comments') + delta)
+
+    def recount(self, author_ids=None):
+        """
+        Rebuild the rows of the given authors from posts and comments.
+
+        Without ``author_ids`` every user is recounted and rows are created
+        for users that have none yet; otherwise only existing rows are
+        updated, as the authors may be being deleted.
+        """
+        authors = User.objects.all()
+        if author_ids is None:
+            self.ensure(authors.values_list('pk', flat=True))
+        else:
+            authors = authors.filter(pk__in=author_ids)
+
+        posts = Post.objects.filter(author=OuterRef('pk')).order_by(
+        ).values('author')
+        visible = posts.filter(is_visible=True)
+        comments = Comment.objects.filter(
+            post__author=OuterRef('pk')
+        ).order_by().values('post__author')
+
+        def total(queryset, aggregate):
+            return Subquery(
+                queryset.annotate(total=aggregate).values('total')
+            )
+
+        return self.filter(author__in=authors).update(
+            post_count=Coalesce(total(posts, Count('pk')), 0),
+            published_count=Coalesce(
+                total(posts.filter(is_published=True), Count('pk')), 0
+            ),
+            comments_received=Coalesce(total(comments, Count('pk')), 0),
+            last_post_at=total(posts, Max('created_at')),
+            visible_count=Coalesce(total(visible, Count('pk')), 0),
+            visible_comments=Coalesce(total(
+                comments.filter(post__is_visible=True), Count('pk')
+            ), 0),
+            last_visible_at=total(visible, Max('pub_date')),
+        )
+
+
+class AuthorStats(models.Model):
+    """
+    Counters shown on the profile page, kept up to date on writes.
+
+    The author sees the figures over all their posts; visitors see the
+    ``visible_*`` ones, which only cover the posts shown in feeds.
+    """
+
+    author = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True,
+        related_name='stats',
+        verbose_name='Автор'
+    )
+    post_count = models.PositiveIntegerField(
+        default=0, verbose_name='Публикаций'
+    )
+    published_count = models.PositiveIntegerField(
+        default=0, verbose_name='Опубликовано'
+    )
+    comments_received = models.PositiveIntegerField(
+        default=0, verbose_name='Комментариев к публикациям'
+    )
+    last_post_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Последняя публикация'
+    )
+    visible_count = models.PositiveIntegerField(
+        default=0, verbose_name='Публикаций в лентах'
+    )
+    visible_comments = models.PositiveIntegerField(
+        default=0, verbose_name='Комментариев к публикациям в лентах'
+    )
+    last_visible_at = models.DateTimeField(
+        null=True, blank=True,
+        verbose_name='Дата последней публикации в лентах'
+    )
+
+    objects = AuthorStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'Статистика {self.author_id}'
+
+
+class CategoryStatsQuerySet(StatsQuerySet):
+    def add_post(self, post):
+        if not post.is_published or post.category_id is None:
+            return
+        self.ensure([post.category_id])
+        if not post.is_visible:
+            return
+        rows = self.filter(pk=post.category_id)
+        rows.update(post_count=F('post_count') + 1)
+        rows.filter(
+            Q(latest_post__isnull=True)
+            | Q(latest_post__pub_date__lte=post.pub_date)
+        ).update(latest_post=post)
+
+    def recount(self, category_ids=None):
+        """
+        Rebuild the rows of the given categories from the posts table.
+
+        Without ``category_ids`` every category is recounted. Rows are
+        created for existing categories that have none yet.
+        """
+        categories = Category.objects.all()
+        if category_ids is not None:
+            categories = categories.filter(pk__in=category_ids)
+        self.ensure(categories.values_list('pk', flat=True))
+
+        posts = Post.objects.filter(category=OuterRef('pk')).order_by()
+        visible = posts.filter(is_visible=True)
+        return self.filter(category__in=categories).update(
+            post_count=Coalesce(Subquery(
+                visible.values('category').annotate(
+                    total=Count('pk')
+                ).values('total')
+            ), 0),
+            latest_post=Subquery(
+                visible.order_by('-pub_date', '-id').values('pk')[:1]
+            ),
+        )
+
+
+class CategoryStats(models.Model):
+    """Visible post counter and latest post of a category."""
+
+    category = models.OneToOneField(
+        Category, on_delete=models.CASCADE, primary_key=True,
+        related_name='stats',
+        verbose_name='Категория'
+    )
+    post_count = models.PositiveIntegerField(
+        default=0, verbose_name='Публикаций'
+    )
+    latest_post = models.ForeignKey(
+        Post, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+',
+        verbose_name='Последняя публикация'
+    )
+
+    objects = CategoryStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'статистика категории'
+        verbose_name_plural = 'Статистика категорий'
+
+    def __str__(self):
+        return f'Статистика {self.category_id}'
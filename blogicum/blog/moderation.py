@@ -0,0 +1,154 @@
+"""
+Bulk moderation of posts and comments.
+
+Every operation reads the selected keys once and changes the rows with
+set-based statements over batches of ``BATCH_SIZE`` keys, which keeps
+each statement under the bound parameter limit of the database when the
+whole changelist is selected. It then does, per batch rather than per
+row, the bookkeeping that signals do for single saves: feed
+invalidation, comment counters, author and category statistics, the
+search index and image derivatives. Deletes go through
+``QuerySet.delete()``, so cascades and ``SET_NULL`` of related models
+are handled by Django, with the per-row signal bookkeeping switched off
+by ``bulk_change()``. Each call leaves a ``ModerationAction`` record.
+"""
+from django.db import transaction
+from django.utils.timezone import now
+
+from .cache import category_scope, invalidate_feeds, post_feed_scopes
+from .images import delete_derivatives
+from .models import (
+    AuthorStats, CategoryStats, Comment, ModerationAction, Post
+)
+from .scheduling import visibility
+from .search import unindex_posts
+from .signals import bulk_change
+
+
+def record(moderator, action, model, ids, **details):
+    return ModerationAction.objects.create(
+        moderator=moderator,
+        action=action,
+        target=model._meta.label_lower,
+        object_ids=ids,
+        object_count=len(ids),
+        details=details,
+    )
+
+
+BATCH_SIZE = 500
+
+
+def batches(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def selected_ids(queryset):
+    return list(queryset.order_by().values_list('pk', flat=True))
+
+
+def post_values(post_ids, field):
+    values = set()
+    for batch in batches(post_ids):
+        values.update(Post.objects.filter(
+            pk__in=batch, **{f'{field}__isnull': False}
+        ).values_list(field, flat=True))
+    return values
+
+
+def post_authors(post_ids):
+    return post_values(post_ids, 'author_id')
+
+
+def post_categories(post_ids):
+    return post_values(post_ids, 'category_id')
+
+
+def feed_scopes(post_ids):
+    scopes = set()
+    for batch in batches(post_ids):
+        scopes |= post_feed_scopes(*batch)
+    return scopes
+
+
+def recount_stats(authors=(), categories=()):
+    for batch in batches(authors):
+        AuthorStats.objects.recount(batch)
+    for batch in batches(categories):
+        CategoryStats.objects.recount(batch)
+
+
+@transaction.atomic
+def set_posts_published(queryset, is_published, moderator=None):
+    ids = selected_ids(queryset)
+    for batch in batches(ids):
+        Post.objects.filter(pk__in=batch).update(
+            is_published=is_published, is_visible=visibility(is_published),
+            updated_at=now()
+        )
+    recount_stats(post_authors(ids), post_categories(ids))
+    invalidate_feeds(*feed_scopes(ids))
+    record(
+        moderator,
+        ModerationAction.PUBLISH if is_published
+        else ModerationAction.UNPUBLISH,
+        Post, ids
+    )
+    return len(ids)
+
+
+@transaction.atomic
+def move_posts(queryset, category, moderator=None):
+    ids = selected_ids(queryset)
+    scopes = feed_scopes(ids)
+    categories = post_categories(ids) | {category.pk}
+    for batch in batches(ids):
+        Post.objects.filter(pk__in=batch).update(
+            category=category, updated_at=now()
+        )
+    recount_stats(categories=categories)
+    invalidate_feeds(*scopes, category_scope(category.slug))
+    record(
+        moderator, ModerationAction.MOVE, Post, ids, category=category.slug
+    )
+    return len(ids)
+
+
+@transaction.atomic
+def delete_posts(queryset, moderator=None):
+    rows = list(queryset.order_by().values_list('pk', 'image_variants'))
+    ids = [pk for pk, _ in rows]
+    authors, categories = post_authors(ids), post_categories(ids)
+    invalidate_feeds(*feed_scopes(ids))
+    with bulk_change():
+        for batch in batches(ids):
+            posts = Post.objects.filter(pk__in=batch)
+            posts.delete()
+            unindex_posts(batch, posts.db)
+    recount_stats(authors, categories)
+
+    storage = Post._meta.get_field('image').storage
+    transaction.on_commit(lambda: [
+        delete_derivatives(variants, storage) for _, variants in rows
+    ])
+    record(moderator, ModerationAction.DELETE, Post, ids)
+    return len(ids)
+
+
+@transaction.atomic
+def delete_comments(queryset, moderator=None):
+    ids = selected_ids(queryset)
+    post_ids = set(
+        queryset.order_by().values_list('post_id', flat=True).distinct()
+    )
+    with bulk_change():
+        for batch in batches(ids):
+            Comment.objects.filter(pk__in=batch).delete()
+    for batch in batches(post_ids):
+        Post.objects.filter(pk__in=batch).update_comment_count()
+    recount_stats(post_authors(post_ids))
+    invalidate_feeds(*feed_scopes(post_ids))
+    record(moderator, ModerationAction.DELETE, Comment, ids)
+    return len(ids)
@@ -0,0 +1,188 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+class KeysetPage:
+    """A page of objects fetched by a keyset (cursor) condition."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginator that seeks by the ordering key instead of OFFSET.
+
+    The queryset is ordered by ``ordering`` (which must end with a unique
+    field) and each page is fetched with a ``WHERE key < last_key`` condition,
+    so neither ``COUNT(*)`` nor a growing ``OFFSET`` is ever issued.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-id')):
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(field.lstrip('-') for field in self.ordering)
+        self.queryset = queryset.order_by(*self.ordering)
+
+    def encode_cursor(self, obj, backwards=False):
+        values = [getattr(obj, field) for field in self.fields]
+        payload = json.dumps(
+            ['p' if backwards else 'n', *values], default=str
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            direction, *values = json.loads(
+                base64.urlsafe_b64decode(cursor.encode())
+            )
+        except (ValueError, TypeError, binascii.Error):
+            raise Http404('Неверный курсор страницы')
+        if direction not in ('n', 'p') or len(values) != len(self.fields):
+            raise Http404('Неверный курсор страницы')
+        return direction == 'p', [
+            self._parse_value(field, value)
+            for field, value in zip(self.fields, values)
+        ]
+
+    def _parse_value(self, field, value):
+        model_field = self.queryset.model._meta.get_field(field)
+        try:
+            value = model_field.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise Http404('Неверный курсор страницы')
+        if value is None:
+            raise Http404('Неверный курсор страницы')
+        return value
+
+    def _seek_condition(self, values, backwards):
+        """Build ``(f1, f2, ...) > (v1, v2, ...)`` as a portable Q tree."""
+        condition = Q()
+        for index, (ordering, value) in enumerate(zip(self.ordering, values)):
+            descending = ordering.startswith('-')
+            lookup = 'gt' if descending == backwards else 'lt'
+            condition |= Q(
+                **dict(zip(self.fields[:index], values[:index])),
+                **{f'{self.fields[index]}__{lookup}': value}
+            )
+        return condition
+
+    def _page_queryset(self, cursor):
+        queryset = self.queryset
+        backwards = False
+        if cursor:
+            backwards, values = self.decode_cursor(cursor)
+            queryset = queryset.filter(self._seek_condition(values, backwards))
+            if backwards:
+                queryset = queryset.reverse()
+        return queryset[:self.per_page + 1], backwards
+
+    def _build_page(self, object_list, cursor, backwards):
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if backwards:
+            object_list.reverse()
+
+        has_next = has_more if not backwards else True
+        has_previous = has_more if backwards else bool(cursor)
+        next_cursor = previous_cursor = None
+        if object_list and has_next:
+            next_cursor = self.encode_cursor(object_list[-1])
+        if object_list and has_previous:
+            previous_cursor = self.encode_cursor(
+                object_list[0], backwards=True
+            )
+        return KeysetPage(object_list, self, next_cursor, previous_cursor)
+
+    def page(self, cursor=None):
+        queryset, backwards = self._page_queryset(cursor)
+        return self._build_page(list(queryset), cursor, backwards)
+
+    async def apage(self, cursor=None):
+        """Async version of ``page()`` using the async ORM."""
+        queryset, backwards = self._page_queryset(cursor)
+        object_list = [obj async for obj in queryset]
+        return self._build_page(object_list, cursor, backwards)
+
+
+def estimate_count(model, using):
+    """
+    Cheap row count of the whole table.
+
+    Reads the planner statistics on PostgreSQL and the highest primary key
+    elsewhere, so rows deleted since are still counted.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row and row[0] > 0:
+            return int(row[0])
+    return model._default_manager.using(using).aggregate(
+        total=Max('pk')
+    )['total'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of large tables.
+
+    An unfiltered queryset is counted from ``estimate_count`` once the
+    table holds more than ``ADMIN_EXACT_COUNT_LIMIT`` rows; filtered
+    querysets and small tables get the exact ``COUNT(*)``.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate()
+        if estimate is None:
+            return super().count
+        return estimate
+
+    def _estimate(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query') or queryset.query.has_filters():
+            return None
+        estimate = estimate_count(queryset.model, queryset.db)
+        if estimate > settings.ADMIN_EXACT_COUNT_LIMIT:
+            return estimate
+        return None
@@ -0,0 +1,58 @@
+"""
+Publication of scheduled posts.
+
+Feeds show the posts with ``is_visible`` set. Saving a post sets it when
+the post is published and its date has come; for posts scheduled in the
+future the activator sets it once the date passes and invalidates the
+caches that show them, so no feed query compares dates with ``now()``.
+The activator runs in its own process; web workers see its invalidation
+through the shared versions cache (check blog.W001).
+"""
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils.timezone import now
+
+from .cache import invalidate_feeds, post_feed_scopes
+from .models import AuthorStats, CategoryStats, Post
+
+
+def is_due(post, moment=None):
+    return post.is_published and post.pub_date <= (moment or now())
+
+
+def visibility(is_published, moment=None):
+    """Expression for ``is_visible`` in a bulk update of ``is_published``."""
+    if not is_published:
+        return Value(False)
+    return Case(
+        When(pub_date__lte=moment or now(), then=Value(True)),
+        default=Value(False)
+    )
+
+
+def scheduled_posts():
+    return Post.objects.filter(is_published=True, is_visible=False)
+
+
+def next_activation():
+    """Publication date of the earliest scheduled post, if any."""
+    return scheduled_posts().order_by('pub_date').values_list(
+        'pub_date', flat=True
+    ).first()
+
+
+@transaction.atomic
+def activate_scheduled_posts(moment=None):
+    """Make the scheduled posts due by ``moment`` visible; return their ids."""
+    due = scheduled_posts().filter(pub_date__lte=moment or now())
+    ids = list(due.values_list('pk', flat=True))
+    if ids:
+        due.filter(pk__in=ids).update(is_visible=True)
+        CategoryStats.objects.recount(set(Post.objects.filter(
+            pk__in=ids, category__isnull=False
+        ).values_list('category_id', flat=True)))
+        AuthorStats.objects.recount(set(Post.objects.filter(
+            pk__in=ids
+        ).values_list('author_id', flat=True)))
+        invalidate_feeds(*post_feed_scopes(*ids))
+    return ids
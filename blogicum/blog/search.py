@@ -0,0 +1,151 @@
+import re
+
+import snowballstemmer
+from django.db import OperationalError, connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'blog_post_search'
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+WORD_RE = re.compile(r'\w+')
+
+_stemmer = snowballstemmer.stemmer('russian')
+_available = {}
+
+
+def stem_words(text):
+    """Split text into lowercase words reduced to their Russian stems."""
+    words = WORD_RE.findall(text.lower().replace('ё', 'е'))
+    return _stemmer.stemWords(words)
+
+
+def stemmed(text):
+    return ' '.join(stem_words(text))
+
+
+def create_search_table(connection):
+    """Create the FTS5 table; return False if SQLite lacks FTS5."""
+    if connection.vendor != 'sqlite':
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} '
+                f'USING fts5(title, text)'
+            )
+    except OperationalError:
+        return False
+    finally:
+        _available.pop(connection.alias, None)
+    return True
+
+
+def drop_search_table(connection):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+        _available.pop(connection.alias, None)
+
+
+def search_available(using='default'):
+    """Whether the full-text index exists in the given database."""
+    if using not in _available:
+        connection = connections[using]
+        _available[using] = (
+            connection.vendor == 'sqlite'
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _available[using]
+
+
+def index_posts(rows, using='default'):
+    """Add or replace ``(id, title, text)`` rows in the full-text index."""
+    if not search_available(using):
+        return
+    rows = [(pk, stemmed(title), stemmed(text)) for pk, title, text in rows]
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(pk,) for pk, _, _ in rows]
+        )
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+            f'VALUES (%s, %s, %s)', rows
+        )
+
+
+def unindex_posts(post_ids, using='default'):
+    if not search_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(pk,) for pk in post_ids]
+        )
+
+
+def rebuild_index(queryset, batch_size=2000):
+    """Reindex every post of the queryset; return how many were indexed."""
+    using = queryset.db
+    if not search_available(using):
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    indexed = 0
+    batch = []
+    for row in queryset.values_list('id', 'title', 'text').iterator(
+        chunk_size=batch_size
+    ):
+        batch.append(row)
+        if len(batch) == batch_size:
+            index_posts(batch, using)
+            indexed += len(batch)
+            batch = []
+    index_posts(batch, using)
+    return indexed + len(batch)
+
+
+def term_pattern(term):
+    """Regular expression for a stem that also matches «ё» for «е»."""
+    return re.escape(term).replace('е', '[её]')
+
+
+def search_posts(queryset, query):
+    """
+    Filter posts matching every word of the query, best matches first.
+
+    Uses the FTS5 index ranked with bm25 where it exists, otherwise falls
+    back to a case-insensitive substring search ordered by date. The
+    fallback uses ``iregex``: SQLite's LIKE and LOWER() only fold ASCII
+    letters, while Django runs its REGEXP through Python's ``re``.
+    """
+    terms = stem_words(query)
+    if not terms:
+        return queryset.none()
+    if not search_available(queryset.db):
+        condition = Q()
+        for term in terms:
+            pattern = term_pattern(term)
+            condition &= Q(title__iregex=pattern) | Q(text__iregex=pattern)
+        return queryset.filter(condition)
+
+    post_table = queryset.model._meta.db_table
+    match = ' '.join(f'"{term}"*' for term in terms)
+    matching_ids = RawSQL(
+        f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+        (match,)
+    )
+    # bm25() needs the full-text query, so the rank of each matching post
+    # is read by its rowid from the same MATCH.
+    rank = RawSQL(
+        f'SELECT bm25({SEARCH_TABLE}, %s, %s) FROM {SEARCH_TABLE} '
+        f'WHERE {SEARCH_TABLE} MATCH %s '
+        f'AND {SEARCH_TABLE}.rowid = "{post_table}"."id"',
+        (TITLE_WEIGHT, TEXT_WEIGHT, match),
+        output_field=FloatField()
+    )
+    return queryset.filter(pk__in=matching_ids).annotate(
+        search_rank=rank
+    ).order_by('search_rank', '-pub_date')
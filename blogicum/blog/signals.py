@@ -0,0 +1,245 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from core.tasks import enqueue_once
+from .cache import invalidate_feeds, post_feed_scopes
+from .images import delete_derivatives, derivatives_outdated
+from .lookups import lookup_tables
+from .models import (
+    AuthorStats, Category, CategoryStats, Comment, Location, Post
+)
+from .scheduling import is_due
+from .search import index_posts, unindex_posts
+from .tasks import generate_post_derivatives
+
+User = get_user_model()
+
+_bulk_change = ContextVar('bulk_change', default=False)
+
+
+@contextmanager
+def bulk_change():
+    """
+    Run the block without the per-row bookkeeping of post and comment deletes.
+
+    For bulk deletes that update counters, statistics, the search index
+    and feed caches for the whole set themselves.
+    """
+    token = _bulk_change.set(True)
+    try:
+        yield
+    finally:
+        _bulk_change.reset(token)
+
+
+def per_row(handler):
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not _bulk_change.get():
+            return handler(*args, **kwargs)
+    return wrapper
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+@per_row
+def remember_post_scopes(sender, instance, **kwargs):
+    """Remember the feeds a post is shown in before it changes."""
+    instance._previous_scopes = set()
+    if instance.pk and not kwargs.get('raw'):
+        instance._previous_scopes = post_feed_scopes(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@per_row
+def invalidate_post_feeds(sender, instance, **kwargs):
+    scopes = getattr(instance, '_previous_scopes', set())
+    invalidate_feeds(*scopes | post_feed_scopes(instance.pk))
+
+
+@receiver(post_save, sender=Post)
+def schedule_image_derivatives(sender, instance, raw=False, **kwargs):
+    if not raw and derivatives_outdated(instance):
+        enqueue_once(generate_post_derivatives, instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+@per_row
+def remove_image_derivatives(sender, instance, **kwargs):
+    delete_derivatives(instance.image_variants, instance.image.storage)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, using, **kwargs):
+    index_posts([(instance.pk, instance.title, instance.text)], using)
+
+
+@receiver(post_delete, sender=Post)
+@per_row
+def unindex_post(sender, instance, using, **kwargs):
+    unindex_posts([instance.pk], using)
+
+
+@receiver(pre_save, sender=Post)
+def set_post_visibility(sender, instance, **kwargs):
+    """Show the post in feeds right away unless it is scheduled."""
+    instance.is_visible = is_due(instance)
+
+
+COUNTED_FIELDS = (
+    'author_id', 'category_id', 'is_published', 'is_visible', 'pub_date'
+)
+
+
+@receiver(pre_save, sender=Post)
+def remember_counted_fields(sender, instance, **kwargs):
+    """Remember what the author and category counters of a post use."""
+    instance._previous_counted = None
+    if instance.pk and not kwargs.get('raw'):
+        instance._previous_counted = Post.objects.filter(
+            pk=instance.pk
+        ).values(*COUNTED_FIELDS).first()
+
+
+def previous_if_changed(instance, *fields):
+    previous = getattr(instance, '_previous_counted', None)
+    if previous and any(
+        previous[field] != getattr(instance, field) for field in fields
+    ):
+        return previous
+    return None
+
+
+@receiver(post_save, sender=Post)
+def update_author_stats(sender, instance, created, **kwargs):
+    if created:
+        AuthorStats.objects.add_post(instance)
+        return
+    previous = previous_if_changed(
+        instance, 'author_id', 'is_published', 'is_visible', 'pub_date'
+    )
+    if previous:
+        AuthorStats.objects.recount(
+            {previous['author_id'], instance.author_id}
+        )
+
+
+@receiver(post_save, sender=Post)
+def update_category_stats(sender, instance, created, **kwargs):
+    if created:
+        CategoryStats.objects.add_post(instance)
+        return
+    previous = previous_if_changed(
+        instance, 'category_id', 'is_published', 'is_visible', 'pub_date'
+    )
+    if previous:
+        CategoryStats.objects.recount(
+            {previous['category_id'], instance.category_id} - {None}
+        )
+
+
+@receiver(post_delete, sender=Post)
+@per_row
+def recount_post_stats(sender, instance, **kwargs):
+    AuthorStats.objects.recount([instance.author_id])
+    if instance.category_id is not None:
+        CategoryStats.objects.recount([instance.category_id])
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    """Remember the previous post of an edited comment."""
+    instance._previous_post_id = None
+    if instance.pk and not kwargs.get('raw'):
+        instance._previous_post_id = Comment.objects.filter(
+            pk=instance.pk
+        ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+    elif getattr(instance, '_previous_post_id', None) not in (
+        None, instance.post_id
+    ):
+        Post.objects.filter(
+            pk__in=(instance._previous_post_id, instance.post_id)
+        ).update_comment_count()
+
+
+@receiver(post_delete, sender=Comment)
+@per_row
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).update(comment_count=F('comment_count') - 1)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_received(sender, instance, created, **kwargs):
+    if created:
+        AuthorStats.objects.add_comments(instance.post_id, 1)
+    elif getattr(instance, '_previous_post_id', None) not in (
+        None, instance.post_id
+    ):
+        AuthorStats.objects.recount(Post.objects.filter(
+            pk__in=(instance._previous_post_id, instance.post_id)
+        ).values('author'))
+
+
+@receiver(post_delete, sender=Comment)
+@per_row
+def decrement_comments_received(sender, instance, **kwargs):
+    AuthorStats.objects.add_comments(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@per_row
+def invalidate_comment_feeds(sender, instance, **kwargs):
+    invalidate_feeds(*post_feed_scopes(
+        instance.post_id, getattr(instance, '_previous_post_id', None)
+    ))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_all_feeds(sender, **kwargs):
+    invalidate_feeds()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_lookup_tables(sender, **kwargs):
+    lookup_tables.invalidate()
+
+
+@receiver(pre_save, sender=User)
+def invalidate_renamed_author_feeds(sender, instance, update_fields=None,
+                                    **kwargs):
+    """Drop cached cards of an author whose username is changing."""
+    if not instance.pk or kwargs.get('raw'):
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    previous = User.objects.filter(pk=instance.pk).values_list(
+        'username', flat=True
+    ).first()
+    if previous is not None and previous != instance.username:
+        invalidate_feeds()
@@ -0,0 +1,12 @@
+from core.tasks import task
+from .cache import invalidate_feeds, post_feed_scopes
+from .images import update_post_derivatives
+from .models import Post
+
+
+@task
+def generate_post_derivatives(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        update_post_derivatives(post)
+        invalidate_feeds(*post_feed_scopes(post_id))
@@ -0,0 +1,34 @@
+from django import template
+
+register = template.Library()
+
+CARD_WIDTH = 640
+
+
+@register.inclusion_tag('includes/post_picture.html')
+def post_picture(post, css_class=''):
+    """Render a post image as <picture> built from its derivatives."""
+    image_variants = post.image_variants or {}
+    storage = post.image.storage
+    srcsets = {}
+    fallback = None
+    for variant in image_variants.get('variants', ()):
+        url = storage.url(variant['name'])
+        srcsets.setdefault(variant['type'], []).append(
+            f'{url} {variant["width"]}w'
+        )
+        if variant['type'] == 'image/jpeg' and (
+            fallback is None or abs(variant['width'] - CARD_WIDTH)
+            < abs(fallback['width'] - CARD_WIDTH)
+        ):
+            fallback = dict(variant, url=url)
+    return {
+        'css_class': css_class,
+        'original_url': post.image.url,
+        'width': image_variants.get('width'),
+        'height': image_variants.get('height'),
+        'fallback': fallback,
+        'webp_srcset': ', '.join(srcsets.get('image/webp', ())),
+        'jpeg_srcset': ', '.join(srcsets.get('image/jpeg', ())),
+        'sizes': f'(max-width: {CARD_WIDTH}px) 100vw, {CARD_WIDTH}px',
+    }
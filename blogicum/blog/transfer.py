@@ -0,0 +1,284 @@
+import datetime
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from .cache import invalidate_feeds
+from .lookups import lookup_tables
+from .models import (
+    AuthorStats, Category, CategoryStats, Comment, Location, Post
+)
+from .scheduling import is_due
+from .search import index_posts
+
+User = get_user_model()
+
+# Dependencies first: a record may only refer to records above it.
+TRANSFER_MODELS = (User, Category, Location, Post, Comment)
+
+# Existing rows matched by these fields are reused instead of duplicated.
+NATURAL_KEYS = {User: 'username', Category: 'slug'}
+
+# Temporary table with the new primary key of every imported row.
+PK_MAP_TABLE = 'blog_transfer_pk_map'
+
+
+class TransferError(Exception):
+    pass
+
+
+class TransferEncoder(DjangoJSONEncoder):
+    """Keep microseconds, which DjangoJSONEncoder cuts to milliseconds."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def transfer_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+
+
+def export_records(stream, batch_size=2000, progress=None):
+    """
+    Write every transferred row to the stream as one JSON line.
+
+    Lines use the fixture format of ``dumpdata``, so the file can also be
+    loaded with ``loaddata``. Rows are read in chunks and never held in
+    memory all at once.
+    """
+    encoder = TransferEncoder(ensure_ascii=False)
+    for model in TRANSFER_MODELS:
+        label = model_label(model)
+        fields = transfer_fields(model)
+        rows = model._default_manager.order_by('pk').values_list(
+            'pk', *(field.attname for field in fields)
+        )
+        exported = 0
+        for pk, *values in rows.iterator(chunk_size=batch_size):
+            stream.write(encoder.encode({
+                'model': label,
+                'pk': pk,
+                'fields': {
+                    field.name: value for field, value in zip(fields, values)
+                },
+            }))
+            stream.write('\n')
+            exported += 1
+            if progress and exported % batch_size == 0:
+                progress(label, exported)
+        if progress:
+            progress(label, exported)
+
+
+def auto_timestamp_fields(model):
+    """Fields that ``bulk_create`` overwrites with the current time."""
+    return [
+        field for field in transfer_fields(model)
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+
+
+class Importer:
+    """
+    Load JSON lines written by ``export_records`` in ``bulk_create`` batches.
+
+    Primary keys are reassigned by the database and foreign keys remapped
+    to them, so data can be merged into a populated database; users and
+    categories matching an existing username or slug are reused. The
+    old to new key pairs go to a temporary table and are looked up once
+    per batch, so memory use does not grow with the file. With
+    ``keep_ids`` the stored keys are inserted as is and nothing is
+    remembered per row. Records of other models are skipped.
+    """
+
+    def __init__(self, batch_size=2000, keep_ids=False, progress=None):
+        self.batch_size = batch_size
+        self.keep_ids = keep_ids
+        self.progress = progress
+        self.models = {model_label(model): model for model in TRANSFER_MODELS}
+        self.imported = dict.fromkeys(TRANSFER_MODELS, 0)
+        self.skipped = 0
+        self.started_at = now()
+        self.batch_model = None
+        self.batch = []
+
+    def load(self, lines):
+        with transaction.atomic():
+            if not self.keep_ids:
+                self.execute(
+                    f'CREATE TEMPORARY TABLE {PK_MAP_TABLE} ('
+                    f'model varchar(100) NOT NULL, old_pk bigint NOT NULL, '
+                    f'new_pk bigint NOT NULL, PRIMARY KEY (model, old_pk))'
+                )
+            for number, line in enumerate(lines, start=1):
+                if line.strip():
+                    self.add(number, line)
+            self.flush()
+            if not self.keep_ids:
+                self.execute(f'DROP TABLE {PK_MAP_TABLE}')
+            self.finish()
+        return self.imported
+
+    def execute(self, sql, params=None):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description else None
+
+    def add(self, number, line):
+        try:
+            record = json.loads(line)
+            model = self.models.get(record['model'])
+            if model is None:
+                self.skipped += 1
+                return
+            if model is not self.batch_model or len(self.batch) >= (
+                self.batch_size
+            ):
+                self.flush()
+                self.batch_model = model
+            self.batch.append(
+                (number, record['pk'], self.build(model, record))
+            )
+        except (ValueError, KeyError, TypeError) as error:
+            raise TransferError(f'Строка {number}: {error!r}')
+
+    def build(self, model, record):
+        values = {}
+        for field in transfer_fields(model):
+            if field.name not in record['fields']:
+                if field in auto_timestamp_fields(model):
+                    values[field.attname] = self.started_at
+                continue
+            value = record['fields'][field.name]
+            if not field.is_relation:
+                value = field.to_python(value)
+            values[field.attname] = value
+        if self.keep_ids:
+            values[model._meta.pk.attname] = record['pk']
+        obj = model(**values)
+        if model is Post:
+            obj.is_visible = is_due(obj, self.started_at)
+        return obj
+
+    def remember(self, model, pairs):
+        """Store the new primary keys of ``(old_pk, new_pk)`` pairs."""
+        if pairs:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {PK_MAP_TABLE} (model, old_pk, new_pk) '
+                    f'VALUES (%s, %s, %s)',
+                    [(model_label(model), *pair) for pair in pairs]
+                )
+
+    def new_pks(self, model, old_pks):
+        if not old_pks:
+            return {}
+        placeholders = ', '.join(['%s'] * len(old_pks))
+        return dict(self.execute(
+            f'SELECT old_pk, new_pk FROM {PK_MAP_TABLE} '
+            f'WHERE model = %s AND old_pk IN ({placeholders})',
+            [model_label(model), *old_pks]
+        ))
+
+    def remap(self, model, batch):
+        """Point the foreign keys of a batch at the new primary keys."""
+        if self.keep_ids:
+            return
+        for field in transfer_fields(model):
+            if not field.is_relation:
+                continue
+            related = field.related_model
+            new_pks = self.new_pks(related, {
+                getattr(obj, field.attname) for _, _, obj in batch
+            } - {None})
+            for number, _, obj in batch:
+                pk = getattr(obj, field.attname)
+                if pk is None:
+                    continue
+                if pk not in new_pks:
+                    raise TransferError(
+                        f'Строка {number}: {model_label(related)} #{pk} '
+                        f'не найден выше в файле'
+                    )
+                setattr(obj, field.attname, new_pks[pk])
+
+    def flush(self):
+        if not self.batch:
+            return
+        model, batch = self.batch_model, self.batch
+        self.batch = []
+        self.remap(model, batch)
+        pending = batch
+        key = NATURAL_KEYS.get(model)
+        if key and not self.keep_ids:
+            existing = dict(model._default_manager.filter(**{
+                f'{key}__in': [getattr(obj, key) for _, _, obj in batch]
+            }).values_list(key, 'pk'))
+            pending = []
+            reused = []
+            for entry in batch:
+                _, old_pk, obj = entry
+                if getattr(obj, key) in existing:
+                    reused.append((old_pk, existing[getattr(obj, key)]))
+                else:
+                    pending.append(entry)
+            self.remember(model, reused)
+
+        created = self.create(model, [obj for _, _, obj in pending])
+        if not self.keep_ids and model in (User, Category, Location, Post):
+            self.remember(model, [
+                (old_pk, obj.pk)
+                for (_, old_pk, _), obj in zip(pending, created)
+            ])
+        if model is Post:
+            index_posts([(obj.pk, obj.title, obj.text) for obj in created])
+
+        self.imported[model] += len(batch)
+        if self.progress:
+            self.progress(model_label(model), self.imported[model])
+
+    def create(self, model, objs):
+        """
+        Insert the objects, keeping their stored auto_now(_add) values.
+
+        ``bulk_create`` sets such fields to the current time, so the
+        stored values are written back with one ``bulk_update``.
+        """
+        fields = auto_timestamp_fields(model)
+        stamps = [
+            [getattr(obj, field.attname) for field in fields] for obj in objs
+        ]
+        created = model._default_manager.bulk_create(objs)
+        if fields and created:
+            for obj, values in zip(created, stamps):
+                for field, value in zip(fields, values):
+                    setattr(obj, field.attname, value)
+            model._default_manager.bulk_update(
+                created, [field.name for field in fields],
+                batch_size=self.batch_size
+            )
+        return created
+
+    def finish(self):
+        """Redo the bookkeeping that signals do for single saves."""
+        if self.imported[Comment]:
+            Post.objects.update_comment_count()
+        if self.imported[Post] or self.imported[Comment]:
+            AuthorStats.objects.recount()
+        if self.imported[Post]:
+            CategoryStats.objects.recount()
+        lookup_tables.invalidate()
+        invalidate_feeds()
@@ -1,17 +1,22 @@
+from django.conf import settings
 from django.urls import path, include
 
-from . import views
+from . import api, async_views, feeds, views
+
+read_views = async_views if settings.ASYNC_READ_VIEWS else views
 
 app_name = 'blog'
 
 post_urls = [
     path('create/', views.CreatePostView.as_view(), name='create_post'),
     path('<int:post_id>/',
-         views.PostDetailView.as_view(), name='post_detail'),
+         read_views.PostDetailView.as_view(), name='post_detail'),
     path('<int:post_id>/edit/',
          views.UpdatePostView.as_view(), name='edit_post'),
     path('<int:post_id>/delete/',
          views.DeletePostView.as_view(), name='delete_post'),
+    path('<int:post_id>/comments/',
+         views.post_comments, name='post_comments'),
     path('<int:post_id>/comment/', views.add_comment, name='add_comment'),
     path('<int:post_id>/edit_comment/<int:comment_id>/',
          views.edit_comment, name='edit_comment'),
@@ -19,13 +24,42 @@ post_urls = [
          views.delete_comment, name='delete_comment'),
 ]
 
+feed_urls = [
+    path('rss/', feeds.PostsFeed(), name='feed_rss'),
+    path('atom/', feeds.AtomPostsFeed(), name='feed_atom'),
+    path('category/<slug:category_slug>/rss/',
+         feeds.CategoryFeed(), name='category_feed_rss'),
+    path('category/<slug:category_slug>/atom/',
+         feeds.AtomCategoryFeed(), name='category_feed_atom'),
+    path('profile/<str:username>/rss/',
+         feeds.AuthorFeed(), name='profile_feed_rss'),
+    path('profile/<str:username>/atom/',
+         feeds.AtomAuthorFeed(), name='profile_feed_atom'),
+]
+
+api_urls = [
+    path('posts/', api.posts, name='api_posts'),
+    path('posts/<int:post_id>/', api.post_detail, name='api_post_detail'),
+    path('posts/<int:post_id>/comments/',
+         api.post_comments, name='api_post_comments'),
+    path('categories/', api.categories, name='api_categories'),
+    path('categories/<slug:category_slug>/posts/',
+         api.category_posts, name='api_category_posts'),
+    path('locations/', api.locations, name='api_locations'),
+    path('profiles/<str:username>/posts/',
+         api.profile_posts, name='api_profile_posts'),
+]
+
 urlpatterns = [
-    path('', views.IndexView.as_view(), name='index'),
+    path('', read_views.IndexView.as_view(), name='index'),
     path('posts/', include(post_urls,)),
     path('category/<slug:category_slug>/',
-         views.CategoryPostView.as_view(), name='category_posts'),
+         read_views.CategoryPostView.as_view(), name='category_posts'),
+    path('feeds/', include(feed_urls)),
+    path('api/', include(api_urls)),
+    path('search/', views.SearchView.as_view(), name='search'),
     path('edit-profile/',
          views.EditProfileView.as_view(), name='edit_profile'),
     path('profile/<str:username>/',
-         views.UserProfileView.as_view(), name='profile'),
+         read_views.UserProfileView.as_view(), name='profile'),
 ]
@@ -0,0 +1,22 @@
+from functools import wraps
+
+
+def memoize_per_request(method):
+    """
+    Cache the result of a view method on the view instance.
+
+    Views are instantiated per request, so a lookup shared by
+    get_queryset(), get_context_data() and permission checks hits the
+    database once.
+    """
+    cache_attr = f'_memoized_{method.__name__}'
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.__dict__.setdefault(cache_attr, {})
+        key = (args, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = method(self, *args, **kwargs)
+        return cache[key]
+
+    return wrapper
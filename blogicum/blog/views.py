@@ -1,8 +1,8 @@
+from urllib.parse import urlencode
+
 from django.http import Http404
 from django.urls import reverse_lazy
-from django.db.models import Count
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.timezone import now
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
@@ -11,51 +11,124 @@ from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 
-from blog.models import Category, Comment, Post
+from blog.models import AuthorStats, Comment, Post
 from .forms import CommentForm, PostForm
-from .mixins import AuthorPermissionMixin
+from .lookups import lookup_tables
+from .cache import category_summary
+from .mixins import (
+    AnonymousFeedCacheMixin, AuthorPermissionMixin, ConditionalGetMixin,
+    KeysetPaginationMixin, ReplicaReadMixin
+)
+from .pagination import KeysetPaginator
+from .search import search_posts
+from .utils import memoize_per_request
 from django.conf import settings
 
 
-def get_post_queryset(apply_filters=False, apply_annotations=True):
+def get_post_queryset(apply_filters=False):
     """A common queryset for working with Post."""
-    queryset = Post.objects.select_related('author', 'location', 'category')
+    queryset = Post.objects.select_related('author').with_lookups()
 
     if apply_filters:
+        # Excluding the few unpublished categories keeps the feed on the
+        # pub_date index; an IN list of published ones sends SQLite to the
+        # category index and a sort.
         queryset = queryset.filter(
-            is_published=True,
-            pub_date__lte=now(),
-            category__is_published=True
+            is_visible=True, category__isnull=False
+        ).exclude(
+            category_id__in=lookup_tables.unpublished_category_ids()
         )
-    if apply_annotations:
-        queryset = queryset.annotate(comment_count=Count('comments')
-                                     ).order_by('-pub_date')
-    return queryset
+    return queryset.order_by('-pub_date')
+
+
+def get_published_category(slug):
+    """Return the published category from the lookup tables or 404."""
+    category = lookup_tables.category_by_slug(slug)
+    if category is None or not category.is_published:
+        raise Http404('Категория не найдена')
+    return category
+
+
+def check_post_visible(request, post):
+    """Raise Http404 unless the user may see the post."""
+    is_not_author = post.author_id != request.user.id
+    is_hidden = not post.is_visible
+    is_category_unpublished = not (
+        post.category and post.category.is_published
+    )
+
+    if is_not_author and (is_hidden or is_category_unpublished):
+        raise Http404('Пост недоступен')
+
+
+def get_visible_post(request, post_id):
+    """Return the post if the user may see it, otherwise raise Http404."""
+    post = get_object_or_404(get_post_queryset(), pk=post_id)
+    check_post_visible(request, post)
+    return post
+
+
+def get_comments_paginator(post):
+    """Paginator over the post comments, oldest first."""
+    return KeysetPaginator(
+        post.comments.select_related('author'),
+        settings.COMMENTS_PAGINATION_SIZE,
+        ordering=('created_at', 'id')
+    )
+
+
+def get_comments_page(post, cursor=None):
+    return get_comments_paginator(post).page(cursor)
+
 
+def get_profiles():
+    return User.objects.select_related('stats')
 
-class UserProfileView(ListView):
+
+def get_author_stats(profile):
+    """Stored statistics of the author, zeros if none were kept yet."""
+    return getattr(profile, 'stats', None) or AuthorStats(author=profile)
+
+
+class UserProfileView(AnonymousFeedCacheMixin, ReplicaReadMixin,
+                      ConditionalGetMixin, KeysetPaginationMixin, ListView):
     """A view for displaying the user's profile."""
 
     paginate_by = settings.PAGINATION_SIZE
     template_name = 'blog/profile.html'
 
+    @memoize_per_request
     def get_user_profile(self):
-        return get_object_or_404(User, username=self.kwargs['username'])
+        return get_object_or_404(
+            get_profiles(), username=self.kwargs['username']
+        )
 
     def get_queryset(self):
         user_profile = self.get_user_profile()
 
         queryset = get_post_queryset(
-            apply_filters=self.request.user != user_profile,
-            apply_annotations=True
+            apply_filters=self.request.user != user_profile
         )
         return queryset.filter(author=user_profile)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.get_user_profile()
+        context['stats'] = get_author_stats(context['profile'])
         return context
 
+    def get_validators(self, context):
+        parts, timestamps = super().get_validators(context)
+        profile, stats = context['profile'], context['stats']
+        parts.extend((
+            profile.username, profile.get_full_name(), profile.is_staff,
+            stats.post_count, stats.published_count,
+            stats.comments_received, stats.last_post_at,
+            stats.visible_count, stats.visible_comments,
+            stats.last_visible_at,
+        ))
+        return parts, timestamps
+
 
 class EditProfileView(LoginRequiredMixin, UpdateView):
     """A view for editing the user's profile."""
@@ -113,74 +186,116 @@ class DeletePostView(LoginRequiredMixin, AuthorPermissionMixin, DeleteView):
     pk_url_kwarg = 'post_id'
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ReplicaReadMixin, ConditionalGetMixin, DetailView):
     """A view to display the details of the post."""
 
     model = Post
     template_name = 'blog/detail.html'
-    queryset = get_post_queryset(apply_annotations=False)
-
-    def get_object(self, queryset=None):
-        queryset = self.get_queryset()
-        post = get_object_or_404(
-            queryset.select_related('author', 'category', 'location'),
-            pk=self.kwargs['post_id']
-        )
-
-        user = self.request.user
-
-        is_not_author = post.author != user
-        is_unpublished = not post.is_published
-        is_category_unpublished = not post.category.is_published
-        is_future = post.pub_date > now()
 
-        if is_not_author and (is_unpublished
-                              or is_category_unpublished
-                              or is_future):
-            raise Http404('Пост недоступен')
+    def get_queryset(self):
+        return get_post_queryset()
 
-        return post
+    def get_object(self, queryset=None):
+        return get_visible_post(self.request, self.kwargs['post_id'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = get_comments_page(
+            self.object, self.request.GET.get('cursor')
+        )
         context['form'] = CommentForm()
         return context
 
+    def get_validators(self, context):
+        post, comments = context['post'], context['comments']
+        parts = [post.id, post.card_version, comments.has_next()]
+        timestamps = [post.updated_at, post.pub_date]
+        for comment in comments:
+            parts.extend((comment.id, comment.author.username, comment.text))
+            timestamps.append(comment.created_at)
+        return parts, timestamps
 
-class CategoryPostView(ListView):
+
+class CategoryPostView(AnonymousFeedCacheMixin, ReplicaReadMixin,
+                       ConditionalGetMixin, KeysetPaginationMixin, ListView):
     """A view for displaying posts in a category."""
 
     template_name = 'blog/category.html'
-    context_object_name = 'page_obj'
     paginate_by = settings.PAGINATION_SIZE
 
+    @memoize_per_request
     def get_category(self):
-        return get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
+        return get_published_category(self.kwargs['category_slug'])
 
     def get_queryset(self):
         category = self.get_category()
-        return get_post_queryset(
-            apply_filters=True, apply_annotations=True
-        ).filter(category=category)
+        return get_post_queryset(apply_filters=True).filter(category=category)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.get_category()
         return context
 
+    def get_validators(self, context):
+        parts, timestamps = super().get_validators(context)
+        category = context['category']
+        parts.append(category.updated_at.timestamp())
+        timestamps.append(category.updated_at)
+        return parts, timestamps
+
 
-class IndexView(ListView):
+class IndexView(AnonymousFeedCacheMixin, ReplicaReadMixin,
+                ConditionalGetMixin, KeysetPaginationMixin, ListView):
     """The view for the main page."""
 
     template_name = 'blog/index.html'
     paginate_by = settings.PAGINATION_SIZE
-    queryset = get_post_queryset(apply_filters=True, apply_annotations=True)
-    context_object_name = 'page_obj'
+
+    def get_queryset(self):
+        return get_post_queryset(apply_filters=True)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['category_summary'] = category_summary()
+        return context
+
+    def get_validators(self, context):
+        parts, timestamps = super().get_validators(context)
+        for row in context['category_summary']:
+            parts.extend(row.values())
+        return parts, timestamps
+
+
+class SearchView(ListView):
+    """A view for full-text search over the published posts."""
+
+    template_name = 'blog/search.html'
+    paginate_by = settings.PAGINATION_SIZE
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search_posts(
+            get_post_queryset(apply_filters=True), self.get_search_query()
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.get_search_query()
+        context['search_query'] = query
+        context['page_query'] = f'{urlencode({"q": query})}&'
+        return context
+
+
+def post_comments(request, post_id):
+    """Render the next chunk of the post comments as an HTML fragment."""
+    post = get_visible_post(request, post_id)
+    context = {
+        'post': post,
+        'comments': get_comments_page(post, request.GET.get('cursor'))
+    }
+    return render(request, 'includes/comments.html', context)
 
 
 @login_required
@@ -199,7 +314,7 @@ def add_comment(request, post_id):
 def edit_comment(request, post_id, comment_id):
     comment = get_object_or_404(Comment, id=comment_id, post_id=post_id)
 
-    if comment.author != request.user:
+    if comment.author_id != request.user.id:
         return redirect('blog:post_detail', post_id=post_id)
 
     form = CommentForm(request.POST or None, instance=comment)
@@ -218,7 +333,7 @@ def edit_comment(request, post_id, comment_id):
 def delete_comment(request, post_id, comment_id):
     comment = get_object_or_404(Comment, id=comment_id, post_id=post_id)
 
-    if comment.author != request.user:
+    if comment.author_id != request.user.id:
         return redirect('blog:post_detail', post_id=post_id)
 
     if request.method == 'POST':
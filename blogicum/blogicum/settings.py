@@ -34,6 +34,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.PrimaryPinningMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -61,13 +62,86 @@ STATICFILES_DIRS = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+# Serve the feeds, post and static pages with the async views; only
+# worth it under an ASGI server (blogicum.asgi).
+ASYNC_READ_VIEWS = False
+
+# Applied to every new SQLite connection. WAL lets readers and a writer
+# work concurrently; the rest trades durability of the last transactions
+# on power loss (synchronous=NORMAL) for fewer fsyncs and keeps hot pages
+# and temporary tables in memory.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(
+                f'PRAGMA {name} = {value}'
+                for name, value in SQLITE_PRAGMAS.items()
+            ),
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Read replicas of the default database. Local SQLite replicas are
+# plain copies of it refreshed with ``manage.py sync_replicas``.
+DATABASE_REPLICAS = [
+    # BASE_DIR / 'db.replica.sqlite3',
+]
+
+READ_REPLICAS = []
+for number, replica_name in enumerate(DATABASE_REPLICAS, start=1):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': replica_name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# After a write the client reads from the primary for this long.
+REPLICA_PIN_COOKIE = 'pin_primary'
+REPLICA_PIN_SECONDS = 10
+
+# Rendered feed pages live in the default cache. Their version tokens and
+# the lookup table version live in "versions", which must never evict
+# them and must be shared by every process that serves pages or writes
+# posts (web workers, runworker, activate_scheduled): an invalidation is
+# only seen by processes reading the same cache. The file cache is shared
+# by the processes of one host; with several hosts use Redis or Memcached.
+# A missing or process-local "versions" cache fails the blog checks.
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'CULL_INTERVAL': 60,
+        },
+    },
+    'versions': {
+        'BACKEND': 'core.cache.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'versions',
+        'OPTIONS': {
+            'CULL_INTERVAL': None,
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -103,8 +177,39 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+
+TASK_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 PAGINATION_SIZE = 10
+
+COMMENTS_PAGINATION_SIZE = 20
+
+FEED_CACHE_TIMEOUT = 60
+
+# Processes that serve no requests recheck the lookup tables this often.
+LOOKUP_TABLES_MAX_AGE = 30
+
+SYNDICATION_FEED_SIZE = 20
+
+API_PAGE_SIZE = 20
+
+API_MAX_PAGE_SIZE = 100
+
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
+POST_IMAGE_WIDTHS = (320, 640, 1280)
+
+POST_IMAGE_QUALITY = 80
+
+TASK_QUEUE_EAGER = False
+
+TASK_MAX_ATTEMPTS = 5
+
+TASK_RETRY_DELAY = 30
+
+# A running task not finished in this time is taken to belong to a worker
+# that died and is run again.
+TASK_LEASE_SECONDS = 600
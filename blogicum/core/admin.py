@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'name', 'status', 'attempts', 'run_at', 'locked_until', 'created_at'
+    )
+    list_filter = ('status', 'name')
@@ -0,0 +1,34 @@
+import time
+
+from django.core.cache.backends import filebased
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """
+    File cache that checks its size at most every ``CULL_INTERVAL``.
+
+    Django's backend lists the whole directory on every write to decide
+    whether to cull. Here each process does it at most once per
+    ``CULL_INTERVAL`` seconds (60 by default), so the directory may grow
+    a little past ``MAX_ENTRIES`` in between. ``CULL_INTERVAL = None``
+    never culls: use it for keys that must not be evicted.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_interval = params.get('OPTIONS', {}).get(
+            'CULL_INTERVAL', 60
+        )
+        self._culled_at = None
+
+    def _cull(self):
+        if self._cull_interval is None:
+            return
+        moment = time.monotonic()
+        if (
+            self._culled_at is not None
+            and moment - self._culled_at < self._cull_interval
+        ):
+            return
+        self._culled_at = moment
+        super()._cull()
@@ -0,0 +1,82 @@
+import base64
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .tasks import enqueue, task
+
+
+def serialize_attachments(message):
+    """
+    Return the attachments of a message in a JSON serializable form.
+
+    Binary content is base64 encoded. ``None`` means an attachment that
+    cannot be stored, such as a prebuilt MIME part or an attached message.
+    """
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            return None
+        filename, content, mimetype = attachment
+        if isinstance(content, bytes):
+            attachments.append([
+                filename, base64.b64encode(content).decode(), mimetype, True
+            ])
+        elif isinstance(content, str):
+            attachments.append([filename, content, mimetype, False])
+        else:
+            return None
+    return attachments
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Email backend that hands messages over to the background worker.
+
+    Messages whose attachments cannot be queued are sent right away
+    through ``TASK_EMAIL_BACKEND``.
+    """
+
+    def send_messages(self, email_messages):
+        immediate = []
+        for message in email_messages:
+            attachments = serialize_attachments(message)
+            if attachments is None:
+                immediate.append(message)
+                continue
+            enqueue(send_email, {
+                'subject': message.subject,
+                'body': message.body,
+                'from_email': message.from_email,
+                'to': message.to,
+                'cc': message.cc,
+                'bcc': message.bcc,
+                'reply_to': message.reply_to,
+                'headers': message.extra_headers,
+                'alternatives': [
+                    list(alternative)
+                    for alternative in getattr(message, 'alternatives', ())
+                ],
+                'attachments': attachments,
+            })
+        if immediate:
+            get_connection(
+                settings.TASK_EMAIL_BACKEND, fail_silently=self.fail_silently
+            ).send_messages(immediate)
+        return len(email_messages)
+
+
+@task
+def send_email(message):
+    alternatives = message.pop('alternatives')
+    attachments = message.pop('attachments', [])
+    email = EmailMultiAlternatives(**message)
+    for content, mimetype in alternatives:
+        email.attach_alternative(content, mimetype)
+    for filename, content, mimetype, is_binary in attachments:
+        if is_binary:
+            content = base64.b64decode(content)
+        email.attach(filename, content, mimetype)
+    connection = get_connection(settings.TASK_EMAIL_BACKEND)
+    connection.send_messages([email])
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.tasks import run_pending_tasks
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить накопившиеся задачи и завершить работу.'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза между опросами пустой очереди, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_tasks()
+            if processed:
+                self.stdout.write(f'Выполнено задач: {processed}.')
+            if options['once']:
+                break
+            if not processed:
+                time.sleep(options['sleep'])
@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.routers import PRIMARY
+
+
+class Command(BaseCommand):
+    help = 'Копирует основную базу SQLite в файлы реплик для чтения.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help='Повторять копирование с этим интервалом, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.READ_REPLICAS:
+            self.stdout.write('Реплики не настроены.')
+            return
+        for alias in (PRIMARY, *settings.READ_REPLICAS):
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(
+                    'Копирование поддерживается только для SQLite, '
+                    'используйте репликацию самой СУБД.'
+                )
+        while True:
+            self.sync()
+            if options['interval'] is None:
+                break
+            time.sleep(options['interval'])
+
+    def sync(self):
+        primary = connections[PRIMARY]
+        primary.ensure_connection()
+        for alias in settings.READ_REPLICAS:
+            connections[alias].close()
+            replica = sqlite3.connect(
+                connections[alias].settings_dict['NAME']
+            )
+            try:
+                primary.connection.backup(replica)
+            finally:
+                replica.close()
+            self.stdout.write(f'Реплика {alias} обновлена.')
@@ -0,0 +1,26 @@
+from django.conf import settings
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class PrimaryPinningMiddleware:
+    """
+    Pin a client to the primary database for a while after it writes,
+    so that it reads its own changes before the replicas catch up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.pinned_to_primary = (
+            settings.REPLICA_PIN_COOKIE in request.COOKIES
+        )
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS, httponly=True,
+                samesite='Lax'
+            )
+        return response
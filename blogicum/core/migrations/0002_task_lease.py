@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, help_text='Выполняющуюся задачу после этого времени можно перезапустить.', null=True, verbose_name='Занята до'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'running')), fields=['locked_until'], name='task_running_idx'),
+        ),
+    ]
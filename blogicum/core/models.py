@@ -9,6 +9,67 @@ class BaseModel(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='Изменено'
+    )
 
     class Meta:
         abstract = True
+
+
+class Task(models.Model):
+    """A deferred function call processed by the background worker."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=256, verbose_name='Задача')
+    args = models.JSONField(default=list, verbose_name='Аргументы')
+    kwargs = models.JSONField(
+        default=dict, verbose_name='Именованные аргументы'
+    )
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    run_at = models.DateTimeField(verbose_name='Запустить после')
+    locked_until = models.DateTimeField(
+        null=True, blank=True, verbose_name='Занята до',
+        help_text='Выполняющуюся задачу после этого времени можно '
+                  'перезапустить.'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('run_at', 'id'),
+                condition=models.Q(status='pending'),
+                name='task_pending_idx',
+            ),
+            models.Index(
+                fields=('locked_until',),
+                condition=models.Q(status='running'),
+                name='task_running_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
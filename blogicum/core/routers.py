@@ -0,0 +1,43 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+PRIMARY = 'default'
+
+
+@contextmanager
+def replica_reads():
+    """Route ORM reads made inside the block to a read replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads to a replica inside ``replica_reads()`` and everything
+    else, including all writes, to the primary database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and settings.READ_REPLICAS:
+            return random.choice(settings.READ_REPLICAS)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.READ_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.READ_REPLICAS
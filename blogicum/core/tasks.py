@@ -0,0 +1,137 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(func):
+    """Register a function so that it can be deferred with ``enqueue``."""
+    name = f'{func.__module__}.{func.__name__}'
+    registry[name] = func
+    func.task_name = name
+    return func
+
+
+def enqueue(func, *args, **kwargs):
+    """
+    Defer a registered task; arguments must be JSON serializable.
+
+    The task row is written in the current transaction, so the worker only
+    sees it once the surrounding changes are committed.
+    """
+    name = getattr(func, 'task_name', func)
+    if name not in registry:
+        raise ValueError(f'Task {name!r} is not registered.')
+    if settings.TASK_QUEUE_EAGER:
+        return registry[name](*args, **kwargs)
+    return Task.objects.create(
+        name=name, args=list(args), kwargs=kwargs, run_at=now()
+    )
+
+
+def enqueue_once(func, *args, **kwargs):
+    """
+    Like ``enqueue``, but reuse a pending call with the same arguments.
+
+    For tasks that only bring data up to date, where a second run queued
+    behind the first would repeat its work.
+    """
+    name = getattr(func, 'task_name', func)
+    if name in registry and not settings.TASK_QUEUE_EAGER:
+        pending = Task.objects.filter(
+            name=name, status=Task.PENDING, args=list(args), kwargs=kwargs
+        ).first()
+        if pending is not None:
+            return pending
+    return enqueue(func, *args, **kwargs)
+
+
+def claim_next_task():
+    """
+    Atomically mark the next due task as running and return it.
+
+    The claim is a lease of ``TASK_LEASE_SECONDS``: a running task whose
+    lease has expired belongs to a worker that died and is claimed again,
+    or marked failed once it has used up its attempts.
+    """
+    while True:
+        moment = now()
+        candidate = Task.objects.filter(
+            Q(status=Task.PENDING, run_at__lte=moment)
+            | Q(status=Task.RUNNING, locked_until__lt=moment)
+        ).order_by('run_at', 'id').first()
+        if candidate is None:
+            return None
+        owned = Task.objects.filter(
+            pk=candidate.pk, status=candidate.status,
+            locked_until=candidate.locked_until
+        )
+        if (
+            candidate.status == Task.RUNNING
+            and candidate.attempts >= settings.TASK_MAX_ATTEMPTS
+        ):
+            owned.update(
+                status=Task.FAILED, locked_until=None,
+                last_error='Обработчик не завершил задачу за отведённое время.'
+            )
+            continue
+        locked_until = moment + timedelta(seconds=settings.TASK_LEASE_SECONDS)
+        claimed = owned.update(
+            status=Task.RUNNING, attempts=candidate.attempts + 1,
+            locked_until=locked_until
+        )
+        if claimed:
+            candidate.status = Task.RUNNING
+            candidate.attempts += 1
+            candidate.locked_until = locked_until
+            return candidate
+
+
+def run_task(task_row):
+    # A worker whose lease expired must not overwrite the outcome of the
+    # worker that claimed the task again.
+    owned = Task.objects.filter(
+        pk=task_row.pk, status=Task.RUNNING,
+        locked_until=task_row.locked_until
+    )
+    try:
+        with transaction.atomic():
+            registry[task_row.name](*task_row.args, **task_row.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Task %s #%s failed', task_row.name, task_row.pk)
+        if task_row.attempts < settings.TASK_MAX_ATTEMPTS:
+            delay = settings.TASK_RETRY_DELAY * 2 ** (task_row.attempts - 1)
+            owned.update(
+                status=Task.PENDING, last_error=error, locked_until=None,
+                run_at=now() + timedelta(seconds=delay)
+            )
+        else:
+            owned.update(
+                status=Task.FAILED, last_error=error, locked_until=None
+            )
+        return False
+    owned.update(status=Task.DONE, locked_until=None)
+    return True
+
+
+def run_pending_tasks(limit=None):
+    """Run due tasks until the queue is drained; return how many ran."""
+    processed = 0
+    while limit is None or processed < limit:
+        task_row = claim_next_task()
+        if task_row is None:
+            break
+        run_task(task_row)
+        processed += 1
+    return processed
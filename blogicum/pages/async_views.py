@@ -0,0 +1,16 @@
+from . import views
+
+
+class AsyncTemplateMixin:
+    """Mixin to serve a TemplateView as a coroutine."""
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(self.get_context_data(**kwargs))
+
+
+class AboutPage(AsyncTemplateMixin, views.AboutPage):
+    pass
+
+
+class RulesPage(AsyncTemplateMixin, views.RulesPage):
+    pass
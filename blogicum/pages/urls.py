@@ -1,10 +1,13 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
+
+read_views = async_views if settings.ASYNC_READ_VIEWS else views
 
 app_name = 'pages'
 
 urlpatterns = [
-    path('about/', views.AboutPage.as_view(), name='about'),
-    path('rules/', views.RulesPage.as_view(), name='rules'),
+    path('about/', read_views.AboutPage.as_view(), name='about'),
+    path('rules/', read_views.RulesPage.as_view(), name='rules'),
 ]
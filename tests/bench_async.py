@@ -0,0 +1,187 @@
+"""
+Load test of the sync and async read views under slow concurrent clients.
+
+Not collected by the regular test run; start it explicitly:
+
+    pytest tests/bench_async.py
+
+Both variants are served by the ASGI application (``blogicum.asgi``).
+Every client sends its request and reads each response chunk with a
+delay, like a client on a slow network. The dataset is the one of
+``bench_urls.py`` and follows its ``BENCHMARK_*`` variables.
+
+Environment variables:
+    LOADTEST_CLIENTS   concurrent clients (default 200)
+    LOADTEST_REQUESTS  requests per client (default 5)
+    LOADTEST_DELAY     network delay of a client in seconds (default 0.05)
+    LOADTEST_REPORT    path of the JSON report (default
+                       loadtest_report.json)
+"""
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+
+import pytest
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.test.client import Client
+
+from bench_urls import dataset, git_revision, route_url  # noqa: F401
+from conftest import reload_urlconfs
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+N_CLIENTS = int(os.environ.get("LOADTEST_CLIENTS", 200))
+N_REQUESTS = int(os.environ.get("LOADTEST_REQUESTS", 5))
+DELAY = float(os.environ.get("LOADTEST_DELAY", 0.05))
+REPORT_PATH = os.environ.get("LOADTEST_REPORT", "loadtest_report.json")
+
+ROUTES = (
+    "blog:index", "blog:category_posts", "blog:profile", "blog:post_detail",
+    "pages:about", "pages:rules",
+)
+
+
+class SlowClient:
+    """ASGI client that sends and receives with a network delay."""
+
+    def __init__(self, app, headers):
+        self.app = app
+        self.headers = [(b"host", b"testserver"), *headers]
+
+    async def get(self, url):
+        path, _, query = url.partition("?")
+        request_sent = False
+        finished = asyncio.Event()
+        status = None
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                await asyncio.sleep(DELAY)
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                await asyncio.sleep(DELAY)
+                if not message.get("more_body"):
+                    finished.set()
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": self.headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        await self.app(scope, receive, send)
+        return status
+
+
+async def run_load(app, urls, headers):
+    latencies = []
+    peak_threads = threading.active_count()
+    done = False
+
+    async def sample_threads():
+        nonlocal peak_threads
+        while not done:
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.005)
+
+    async def client_loop(number):
+        client = SlowClient(app, headers)
+        for request_number in range(N_REQUESTS):
+            url = urls[(number + request_number) % len(urls)]
+            started = time.perf_counter()
+            status = await client.get(url)
+            latencies.append(time.perf_counter() - started)
+            assert status == 200, (url, status)
+
+    sampler = asyncio.ensure_future(sample_threads())
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop(i) for i in range(N_CLIENTS)))
+    elapsed = time.perf_counter() - started
+    done = True
+    await sampler
+    return elapsed, latencies, peak_threads
+
+
+def measure(urls, headers):
+    app = get_asgi_application()
+    tracemalloc.start()
+    try:
+        elapsed, latencies, peak_threads = asyncio.run(
+            run_load(app, urls, headers)
+        )
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    def ms(value):
+        return round(value * 1000, 3)
+
+    quantiles = statistics.quantiles(latencies, n=20, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": ms(statistics.median(latencies)),
+        "p95_ms": ms(quantiles[18]),
+        "peak_threads": peak_threads,
+        "peak_memory_kb": round(peak_memory / 1024),
+    }
+
+
+def test_sync_vs_async_read_views(dataset, user):  # noqa: F811
+    client = Client()
+    client.force_login(user)
+    session = client.cookies[settings.SESSION_COOKIE_NAME].value
+    clients = {
+        "anonymous": [],
+        "author": [
+            (b"cookie", f"{settings.SESSION_COOKIE_NAME}={session}".encode())
+        ],
+    }
+    urls = [route_url(route, dataset) for route in ROUTES]
+
+    results = {}
+    try:
+        for mode in ("sync", "async"):
+            settings.ASYNC_READ_VIEWS = mode == "async"
+            reload_urlconfs()
+            for client_name, headers in clients.items():
+                results[f"{mode} [{client_name}]"] = measure(urls, headers)
+    finally:
+        settings.ASYNC_READ_VIEWS = False
+        reload_urlconfs()
+
+    report = {
+        "revision": git_revision(),
+        "load": {
+            "clients": N_CLIENTS,
+            "requests_per_client": N_REQUESTS,
+            "delay_s": DELAY,
+            "urls": urls,
+        },
+        "results": results,
+    }
+    with open(REPORT_PATH, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True, ensure_ascii=False)
+        fh.write("\n")
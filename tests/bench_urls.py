@@ -0,0 +1,246 @@
+"""
+Query-count and latency benchmark for every blog and pages route.
+
+Not collected by the regular test run; start it explicitly:
+
+    pytest tests/bench_urls.py
+
+Environment variables:
+    BENCHMARK_POSTS     number of synthetic posts (default 20000)
+    BENCHMARK_COMMENTS  number of synthetic comments (default 200000)
+    BENCHMARK_REPEAT    requests per route and client (default 20)
+    BENCHMARK_REPORT    path of the JSON report (default
+                        benchmark_report.json)
+
+The report is written with sorted keys so that two runs can be diffed.
+"""
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+
+import django
+import pytest
+from django.db import connection
+from django.template.backends.django import Template
+from django.test.client import Client
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+from blog.search import rebuild_index
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = int(os.environ.get("BENCHMARK_POSTS", 20000))
+N_COMMENTS = int(os.environ.get("BENCHMARK_COMMENTS", 200000))
+N_REPEAT = int(os.environ.get("BENCHMARK_REPEAT", 20))
+REPORT_PATH = os.environ.get("BENCHMARK_REPORT", "benchmark_report.json")
+BATCH_SIZE = 2000
+
+# Routes that must not be benchmarked by the anonymous client because
+# they require authentication and only redirect to the login page.
+LOGIN_REQUIRED = {
+    "blog:create_post", "blog:edit_post", "blog:delete_post",
+    "blog:add_comment", "blog:edit_comment", "blog:delete_comment",
+    "blog:edit_profile",
+}
+POST_ROUTES = {"blog:add_comment"}
+
+
+@pytest.fixture
+def dataset(
+        user, another_user, published_locations, published_category,
+        another_category
+):
+    """Seed posts and comments in bulk around the regular fixtures."""
+    draft = Mixer(commit=False)
+    authors = [user, another_user]
+    categories = [published_category, another_category]
+    start = timezone.now() - timedelta(days=N_POSTS)
+    posts = [
+        draft.blend(
+            Post,
+            author=authors[i % 2],
+            category=categories[i % 2],
+            location=published_locations[i % len(published_locations)],
+            pub_date=start + timedelta(days=i, seconds=i),
+            is_published=True,
+            is_visible=True,
+            image=None,
+        )
+        for i in range(N_POSTS)
+    ]
+    Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+    post_ids = list(Post.objects.values_list("id", flat=True))
+
+    texts = [draft.faker.sentence() for _ in range(100)]
+    rng = random.Random(0)
+    for offset in range(0, N_COMMENTS, BATCH_SIZE):
+        Comment.objects.bulk_create(
+            Comment(
+                post_id=rng.choice(post_ids),
+                author=authors[i % 2],
+                text=texts[i % len(texts)],
+            )
+            for i in range(offset, min(offset + BATCH_SIZE, N_COMMENTS))
+        )
+    Post.objects.update_comment_count()
+    rebuild_index(Post.objects.all())
+
+    post = Post.objects.filter(author=user).order_by("-comment_count")[0]
+    comment = Comment.objects.create(post=post, author=user, text=texts[0])
+    return {
+        "post_id": post.id,
+        "comment_id": comment.id,
+        "category_slug": published_category.slug,
+        "username": user.username,
+        "search_query": post.title.split()[0],
+    }
+
+
+def collect_routes():
+    """Return the ``namespace:name`` of every blog and pages route."""
+    return sorted(
+        f"{namespace}:{name}"
+        for namespace in ("blog", "pages")
+        for name in get_resolver(f"{namespace}.urls").reverse_dict
+        if isinstance(name, str)
+    )
+
+
+def route_url(route, dataset):
+    kwargs_by_route = {
+        "blog:post_detail": ("post_id",),
+        "blog:edit_post": ("post_id",),
+        "blog:delete_post": ("post_id",),
+        "blog:post_comments": ("post_id",),
+        "blog:api_post_detail": ("post_id",),
+        "blog:api_post_comments": ("post_id",),
+        "blog:api_category_posts": ("category_slug",),
+        "blog:api_profile_posts": ("username",),
+        "blog:add_comment": ("post_id",),
+        "blog:edit_comment": ("post_id", "comment_id"),
+        "blog:delete_comment": ("post_id", "comment_id"),
+        "blog:category_posts": ("category_slug",),
+        "blog:category_feed_rss": ("category_slug",),
+        "blog:category_feed_atom": ("category_slug",),
+        "blog:profile": ("username",),
+        "blog:profile_feed_rss": ("username",),
+        "blog:profile_feed_atom": ("username",),
+    }
+    names = kwargs_by_route.get(route, ())
+    url = reverse(route, kwargs={name: dataset[name] for name in names})
+    if route == "blog:search":
+        url += f"?q={dataset['search_query']}"
+    return url
+
+
+@pytest.fixture
+def render_timer(monkeypatch):
+    timings = []
+    original_render = Template.render
+
+    def timed_render(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            timings.append(time.perf_counter() - started)
+
+    monkeypatch.setattr(Template, "render", timed_render)
+    return timings
+
+
+class SQLTimer:
+    """Execute wrapper that counts queries and sums their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+def measure(client, method, url, render_timings):
+    latencies, sql_times, render_times, query_counts = [], [], [], []
+    for _ in range(N_REPEAT):
+        render_timings.clear()
+        sql_timer = SQLTimer()
+        with connection.execute_wrapper(sql_timer):
+            started = time.perf_counter()
+            if method == "post":
+                response = client.post(url, data={"text": "bench"})
+            else:
+                response = client.get(url)
+            latencies.append(time.perf_counter() - started)
+        assert response.status_code < 400, (url, response.status_code)
+        query_counts.append(sql_timer.count)
+        sql_times.append(sql_timer.seconds)
+        render_times.append(sum(render_timings))
+
+    def ms(value):
+        return round(value * 1000, 3)
+
+    quantiles = statistics.quantiles(latencies, n=20, method="inclusive")
+    return {
+        "status": response.status_code,
+        "queries": max(query_counts),
+        "sql_ms": ms(statistics.median(sql_times)),
+        "render_ms": ms(statistics.median(render_times)),
+        "p50_ms": ms(statistics.median(latencies)),
+        "p95_ms": ms(quantiles[18]),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def test_benchmark_routes(dataset, user, render_timer):
+    author_client = Client()
+    author_client.force_login(user)
+    clients = {"anonymous": Client(), "author": author_client}
+
+    results = {}
+    for route in collect_routes():
+        url = route_url(route, dataset)
+        method = "post" if route in POST_ROUTES else "get"
+        for client_name, client in clients.items():
+            if client_name == "anonymous" and route in LOGIN_REQUIRED:
+                continue
+            results[f"{route} [{client_name}]"] = dict(
+                measure(client, method, url, render_timer), url=url
+            )
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "dataset": {
+            "posts": Post.objects.count(),
+            "comments": Comment.objects.count(),
+            "repeat": N_REPEAT,
+        },
+        "routes": results,
+    }
+    with open(REPORT_PATH, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True, ensure_ascii=False)
+        fh.write("\n")
@@ -1,3 +1,4 @@
+import importlib
 import os
 import re
 import time
@@ -19,11 +20,14 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.urls import clear_url_caches
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -41,6 +45,46 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True, scope="session")
+def temporary_caches(tmp_path_factory):
+    """Keep tests away from the cache directories of the project."""
+    root = tmp_path_factory.mktemp("cache")
+    with override_settings(CACHES={
+        alias: {**params, "LOCATION": root / alias}
+        for alias, params in settings.CACHES.items()
+    }):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(temporary_caches):
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    yield
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+def reload_urlconfs():
+    import blog.urls
+    import blogicum.urls
+    import pages.urls
+
+    for module in (blog.urls, pages.urls, blogicum.urls):
+        importlib.reload(module)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_read_views(settings):
+    """Route the read pages to the async views for one test."""
+    settings.ASYNC_READ_VIEWS = True
+    reload_urlconfs()
+    yield
+    settings.ASYNC_READ_VIEWS = False
+    reload_urlconfs()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -363,6 +407,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -0,0 +1,132 @@
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.admin import with_indexed_dates
+from blog.models import Comment, Post
+from blog.pagination import EstimatedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+N_ROWS = 100_000
+
+CHANGELISTS = (
+    "/admin/blog/post/",
+    "/admin/blog/comment/",
+    "/admin/blog/post/?q=title",
+    f"/admin/blog/post/?pub_date__year={timezone.now().year}",
+    f"/admin/blog/comment/?created_at__year={timezone.now().year}"
+    f"&created_at__month={timezone.now().month}",
+)
+
+
+def insert_rows(n_rows, table, columns, values, params):
+    """Insert rows generated by the database itself, bypassing the ORM."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 "
+            f"FROM seq WHERE n < {n_rows}) "
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(values)} FROM seq",
+            params,
+        )
+
+
+@pytest.fixture
+def add_rows(user, published_category, published_location):
+    now = timezone.now()
+
+    def add(n_rows):
+        insert_rows(
+            n_rows, "blog_post",
+            ("is_published", "is_visible", "created_at", "updated_at",
+             "title", "text", "pub_date", "author_id", "category_id",
+             "location_id", "image_variants", "comment_count"),
+            ("%s", "%s", "%s", "%s", "'title ' || n", "'text'", "%s", "%s",
+             "%s", "%s", "'{}'", "0"),
+            [True, True, now, now, now, user.id, published_category.id,
+             published_location.id],
+        )
+        insert_rows(
+            n_rows, "blog_comment",
+            ("post_id", "author_id", "text", "created_at"),
+            ("%s", "%s", "'text'", "%s"),
+            [Post.objects.first().id, user.id, now],
+        )
+
+    return add
+
+
+def changelist_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [query["sql"] for query in ctx.captured_queries]
+
+
+def test_changelist_queries_do_not_grow_with_rows(admin_client, add_rows):
+    add_rows(5)
+    expected = {
+        url: len(changelist_queries(admin_client, url)) for url in CHANGELISTS
+    }
+    add_rows(N_ROWS)
+    for url in CHANGELISTS:
+        queries = changelist_queries(admin_client, url)
+        assert len(queries) <= expected[url], (
+            f"Убедитесь, что число запросов к БД на странице `{url}` не "
+            "растёт с числом строк в таблице."
+        )
+        assert not any(
+            "COUNT(" in sql and "WHERE" not in sql for sql in queries
+        ), (
+            f"Убедитесь, что страница `{url}` не считает все строки "
+            "большой таблицы."
+        )
+
+
+@pytest.mark.parametrize(
+    "url", ["/admin/blog/post/add/", "/admin/blog/comment/add/"]
+)
+def test_change_form_uses_autocomplete(
+        url, admin_client, many_posts_with_published_locations
+):
+    content = admin_client.get(url).content.decode("utf-8")
+    assert "admin-autocomplete" in content
+    assert content.count("<option") < 10, (
+        f"Убедитесь, что форма `{url}` не выводит все связанные записи "
+        "в выпадающих списках."
+    )
+
+
+@pytest.mark.parametrize("kind", ["year", "month", "day"])
+def test_datetimes_match_default(kind, mixer, user):
+    for pub_date in ("2023-12-31 23:00", "2024-01-01 01:00",
+                     "2024-02-29 12:00", "2024-02-29 13:00"):
+        mixer.blend("blog.Post", author=user, pub_date=timezone.make_aware(
+            timezone.datetime.fromisoformat(pub_date)
+        ))
+    queryset = Post.objects.all()
+    assert isinstance(queryset.datetimes("pub_date", kind), QuerySet), (
+        "Убедитесь, что `datetimes()` модели не переопределён."
+    )
+    for order in ("ASC", "DESC"):
+        assert with_indexed_dates(queryset).datetimes(
+            "pub_date", kind, order
+        ) == list(queryset.datetimes("pub_date", kind, order))
+
+
+def test_estimated_count(settings, add_rows):
+    add_rows(20)
+    settings.ADMIN_EXACT_COUNT_LIMIT = 10
+    Comment.objects.filter(pk__lte=5).delete()
+    assert EstimatedCountPaginator(Comment.objects.all(), 10).count == 20, (
+        "Убедитесь, что для большой таблицы без фильтров число строк "
+        "оценивается без COUNT(*)."
+    )
+    assert EstimatedCountPaginator(
+        Comment.objects.filter(pk__gt=10), 10
+    ).count == 10
+    settings.ADMIN_EXACT_COUNT_LIMIT = 100
+    assert EstimatedCountPaginator(Comment.objects.all(), 10).count == 15
@@ -0,0 +1,155 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+pytestmark = pytest.mark.django_db
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    content = b"".join(response.streaming_content) if response.streaming \
+        else response.content
+    return response, json.loads(content)
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category, published_location):
+    def blend(title, **kwargs):
+        fields = {
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **kwargs,
+        }
+        return mixer.blend(
+            "blog.Post", title=title, author=user,
+            category=published_category, location=published_location,
+            **fields,
+        )
+
+    posts = [
+        blend(f"Пост {i}", pub_date=timezone.now() - timedelta(days=i + 1))
+        for i in range(5)
+    ]
+    draft = blend("Черновик", is_published=False)
+    return posts, draft
+
+
+def test_posts_are_paginated_by_cursor(client, api_posts):
+    posts, draft = api_posts
+    url = reverse("blog:api_posts")
+    response, data = get_json(client, url, limit=3)
+    assert response.status_code == 200
+    assert response.streaming, "Убедитесь, что список отдаётся потоком."
+    first_ids = [item["id"] for item in data["results"]]
+    assert first_ids == [post.id for post in posts[:3]]
+    assert data["previous"] is None and data["next"]
+
+    _, data = get_json(client, url, limit=3, cursor=data["next"])
+    assert [item["id"] for item in data["results"]] == [
+        post.id for post in posts[3:]
+    ], "Убедитесь, что курсор ведёт на следующую страницу."
+    assert data["next"] is None
+    assert draft.id not in first_ids
+
+
+def test_sparse_fields_limit_selected_columns(client, api_posts):
+    url = reverse("blog:api_posts")
+    with CaptureQueriesContext(connection) as ctx:
+        _, data = get_json(client, url, fields="id,title")
+    assert set(data["results"][0]) == {"id", "title"}
+    sql = next(
+        query["sql"] for query in ctx.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    )
+    selected = sql.split(" FROM ")[0]
+    assert '"text"' not in selected and "auth_user" not in selected, (
+        "Убедитесь, что `fields=` ограничивает выбираемые столбцы."
+    )
+
+    _, data = get_json(client, url, fields="author,category")
+    assert data["results"][0]["author"] == api_posts[0][0].author.username
+    assert data["results"][0]["category"]["slug"]
+
+
+def test_unknown_field_is_rejected(client, api_posts):
+    response, data = get_json(
+        client, reverse("blog:api_posts"), fields="id,password"
+    )
+    assert response.status_code == 400
+    assert "password" in data["error"]
+
+
+def test_post_detail_follows_visibility(client, user_client, api_posts):
+    posts, draft = api_posts
+    response, data = get_json(
+        client, reverse("blog:api_post_detail", args=(posts[0].id,)),
+        fields="title,text",
+    )
+    assert response.status_code == 200
+    assert data == {"title": posts[0].title, "text": posts[0].text}
+
+    draft_url = reverse("blog:api_post_detail", args=(draft.id,))
+    assert client.get(draft_url).status_code == 404, (
+        "Убедитесь, что API не отдаёт неопубликованный пост чужим "
+        "пользователям."
+    )
+    assert user_client.get(draft_url).status_code == 200
+
+
+def test_comments_categories_locations_and_profiles(
+        client, api_posts, user, published_category, published_location,
+        mixer
+):
+    post = api_posts[0][0]
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    _, data = get_json(
+        client, reverse("blog:api_post_comments", args=(post.id,))
+    )
+    assert data["results"][0]["text"] == comment.text
+
+    _, data = get_json(client, reverse("blog:api_categories"))
+    assert published_category.slug in {c["slug"] for c in data["results"]}
+
+    _, data = get_json(client, reverse("blog:api_locations"))
+    assert published_location.name in {
+        location["name"] for location in data["results"]
+    }
+
+    _, data = get_json(
+        client,
+        reverse("blog:api_category_posts", args=(published_category.slug,)),
+    )
+    assert len(data["results"]) == 5
+
+    _, data = get_json(
+        client, reverse("blog:api_profile_posts", args=(user.username,))
+    )
+    assert len(data["results"]) == 5
+
+
+def test_unpublished_location_is_hidden(client, api_posts, mixer):
+    post = api_posts[0][0]
+    post.location = mixer.blend("blog.Location", is_published=False)
+    post.save()
+    url = reverse("blog:api_post_detail", args=(post.id,))
+    _, data = get_json(client, url, fields="location")
+    assert data == {"location": None}, (
+        "Убедитесь, что API не показывает название неопубликованного"
+        " местоположения."
+    )
+
+    _, data = get_json(client, reverse("blog:api_posts"), fields="location")
+    assert data["results"][0]["location"] is None
+    assert data["results"][1]["location"] == api_posts[0][1].location.name
+
+
+def test_api_rejects_writes_and_bad_cursors(client, api_posts):
+    url = reverse("blog:api_posts")
+    assert client.post(url).status_code == 405
+    response, data = get_json(client, url, cursor="bad")
+    assert response.status_code == 404 and "error" in data
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def read_urls(post_with_published_location, published_category, user):
+    return {
+        "blog:index": reverse("blog:index"),
+        "blog:category_posts": reverse(
+            "blog:category_posts", args=(published_category.slug,)
+        ),
+        "blog:profile": reverse("blog:profile", args=(user.username,)),
+        "blog:post_detail": reverse(
+            "blog:post_detail", args=(post_with_published_location.id,)
+        ),
+        "pages:about": reverse("pages:about"),
+        "pages:rules": reverse("pages:rules"),
+    }
+
+
+def fetch(client, url, **extra):
+    return async_to_sync(client.get)(url, **extra)
+
+
+def test_read_views_are_async(async_read_views, read_urls):
+    for name, url in read_urls.items():
+        view = resolve(url).func
+        assert asyncio.iscoroutinefunction(view), (
+            f"Убедитесь, что при ASYNC_READ_VIEWS маршрут `{name}` "
+            "обслуживается асинхронным представлением."
+        )
+
+
+@pytest.mark.parametrize("logged_in", [False, True])
+def test_async_views_render_like_sync_views(
+        client, user_client, user, read_urls, logged_in, request
+):
+    sync_client = user_client if logged_in else client
+    expected = {
+        name: sync_client.get(url) for name, url in read_urls.items()
+    }
+    cache.clear()
+    request.getfixturevalue("async_read_views")
+    async_client = AsyncClient()
+    if logged_in:
+        async_client.force_login(user)
+    for name, url in read_urls.items():
+        response = fetch(async_client, url)
+        assert response.status_code == 200, name
+        assert response.templates[0].name == expected[name].templates[0].name
+        if "page_obj" in expected[name].context:
+            assert [p.id for p in response.context["page_obj"]] == [
+                p.id for p in expected[name].context["page_obj"]
+            ], f"Убедитесь, что `{name}` показывает те же посты."
+
+
+def test_async_views_keep_visibility_rules(
+        async_read_views, mixer, user, published_category
+):
+    draft = mixer.blend(
+        "blog.Post", author=user, is_published=False,
+        category=published_category,
+    )
+    url = reverse("blog:post_detail", args=(draft.id,))
+    assert fetch(AsyncClient(), url).status_code == 404
+    author_client = AsyncClient()
+    author_client.force_login(user)
+    assert fetch(author_client, url).status_code == 200
+
+
+def test_async_views_keep_validators_and_page_cache(
+        async_read_views, read_urls, django_assert_num_queries
+):
+    client = AsyncClient()
+    url = read_urls["blog:index"]
+    response = fetch(client, url)
+    assert response.has_header("ETag")
+    with django_assert_num_queries(0):
+        cached = fetch(client, url, headers={"If-None-Match": response["ETag"]})
+    assert cached.status_code == 304
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.lookups import lookup_tables
+from blog.models import AuthorStats, Comment, Post
+from blog.scheduling import activate_scheduled_posts
+
+pytestmark = [pytest.mark.django_db]
+
+STATS_FIELDS = (
+    "post_count", "published_count", "comments_received", "last_post_at",
+    "visible_count", "visible_comments", "last_visible_at",
+)
+
+
+def stored(author):
+    return AuthorStats.objects.filter(author=author).values(
+        *STATS_FIELDS
+    ).first()
+
+
+def recounted(author):
+    AuthorStats.objects.recount()
+    return stored(author)
+
+
+def test_stats_follow_writes(mixer, user, another_user):
+    posts = mixer.cycle(3).blend(Post, author=user, is_published=True)
+    assert stored(user)["post_count"] == 3
+
+    posts[0].is_published = False
+    posts[0].save()
+    comments = mixer.cycle(4).blend(Comment, post=posts[1])
+    comments[0].delete()
+    comments[1].post = posts[2]
+    comments[1].save()
+    posts[2].author = another_user
+    posts[2].save()
+    posts[1].delete()
+
+    for author in (user, another_user):
+        current = stored(author)
+        assert current == recounted(author), (
+            "Убедитесь, что статистика автора обновляется при создании,"
+            " изменении и удалении публикаций и комментариев."
+        )
+    assert stored(user)["post_count"] == 1
+    assert stored(another_user)["comments_received"] == 1
+
+
+def test_profile_shows_stats(client, mixer, user, published_category):
+    post = mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    mixer.cycle(2).blend(Comment, post=post)
+    mixer.blend(Post, author=user, is_published=False)
+    content = client.get(f"/profile/{user.username}/").content.decode()
+    assert "Публикаций: 1" in content, (
+        "Убедитесь, что на странице профиля показано число опубликованных"
+        " постов автора."
+    )
+    assert "Комментариев к публикациям: 2" in content
+
+
+def test_visitors_see_visible_posts_only(
+        client, mixer, user, published_category
+):
+    scheduled = mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    mixer.cycle(2).blend(Comment, post=scheduled)
+    url = f"/profile/{user.username}/"
+    content = client.get(url).content.decode()
+    assert "Публикаций: 0" in content, (
+        "Убедитесь, что посетители профиля не видят в счётчиках отложенные"
+        " публикации и черновики."
+    )
+    assert "Комментариев к публикациям: 0" in content
+    assert "Последняя публикация: нет" in content
+
+    client.force_login(user)
+    content = client.get(url).content.decode()
+    assert "Публикаций: 1 (опубликовано: 1)" in content, (
+        "Убедитесь, что автор видит в профиле все свои публикации."
+    )
+    client.logout()
+
+    activate_scheduled_posts(scheduled.pub_date)
+    assert stored(user) == recounted(user)
+    assert stored(user)["last_visible_at"] == scheduled.pub_date
+    content = client.get(url).content.decode()
+    assert "Публикаций: 1" in content, (
+        "Убедитесь, что публикация попадает в счётчик профиля после"
+        " наступления даты публикации."
+    )
+    assert "Комментариев к публикациям: 2" in content
+
+
+def test_profile_without_posts(client, user):
+    content = client.get(f"/profile/{user.username}/").content.decode()
+    assert "Публикаций: 0" in content
+    assert not AuthorStats.objects.exists()
+
+
+def test_profile_query_count_does_not_depend_on_history(
+        client, mixer, user
+):
+    url = f"/profile/{user.username}/"
+
+    def count_queries(query):
+        lookup_tables.refresh()
+        with CaptureQueriesContext(connection) as ctx:
+            client.get(f"{url}?{query}")
+        return len(ctx.captured_queries)
+
+    mixer.blend(Post, author=user)
+    expected = count_queries("short")
+    mixer.cycle(20).blend(Post, author=user)
+    mixer.cycle(20).blend(Comment, post=Post.objects.first())
+    assert count_queries("long") == expected, (
+        "Убедитесь, что число запросов страницы профиля не зависит от"
+        " истории автора."
+    )
+
+
+def test_user_deletion_with_posts(mixer, user):
+    post = mixer.blend(Post, author=user)
+    mixer.blend(Comment, post=post)
+    user.delete()
+    assert not AuthorStats.objects.exists()
+
+
+def test_recount_counters_repairs_stats(mixer, user):
+    mixer.cycle(2).blend(Post, author=user, is_published=True)
+    AuthorStats.objects.update(post_count=42, published_count=0)
+    call_command("recount_counters", stdout=StringIO())
+    assert stored(user)["post_count"] == 2
+    assert stored(user)["published_count"] == 2
@@ -0,0 +1,137 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.cache import category_summary
+from blog.models import CategoryStats, Post
+from blog.scheduling import activate_scheduled_posts
+
+pytestmark = [pytest.mark.django_db]
+
+STATS_FIELDS = ("post_count", "latest_post")
+
+
+def stored(category):
+    return CategoryStats.objects.filter(category=category).values(
+        *STATS_FIELDS
+    ).first()
+
+
+def recounted(category):
+    CategoryStats.objects.recount()
+    return stored(category)
+
+
+def test_stats_follow_writes(
+        mixer, user, published_category, another_category
+):
+    now = timezone.now()
+
+    def blend(**kwargs):
+        fields = {
+            "author": user, "category": published_category,
+            "is_published": True, **kwargs,
+        }
+        return mixer.blend(Post, **fields)
+
+    old = blend(pub_date=now - timedelta(days=2))
+    latest = blend(pub_date=now - timedelta(days=1))
+    scheduled = blend(pub_date=now + timedelta(days=1))
+    blend(pub_date=now - timedelta(hours=1), is_published=False)
+    assert stored(published_category) == {
+        "post_count": 2, "latest_post": latest.id,
+    }, (
+        "Убедитесь, что счётчик категории учитывает только опубликованные"
+        " посты с наступившей датой публикации."
+    )
+
+    latest.category = another_category
+    latest.save()
+    scheduled.pub_date = now - timedelta(hours=2)
+    scheduled.save()
+    old.is_published = False
+    old.save()
+    for category in (published_category, another_category):
+        assert stored(category) == recounted(category)
+    assert stored(published_category)["latest_post"] == scheduled.id
+
+    scheduled.delete()
+    assert stored(published_category) == {
+        "post_count": 0, "latest_post": None
+    }
+
+
+def test_scheduled_post_counted_when_activated(
+        mixer, user, published_category
+):
+    post = mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert category_summary() == []
+
+    activate_scheduled_posts(post.pub_date)
+    assert category_summary() == [{
+        "slug": published_category.slug,
+        "title": published_category.title,
+        "post_count": 1,
+        "latest_id": post.id,
+        "latest_title": post.title,
+    }], (
+        "Убедитесь, что отложенная публикация попадает в счётчик категории"
+        " после наступления даты публикации."
+    )
+
+
+def test_index_sidebar(
+        client, mixer, user, published_category, another_category
+):
+    post = mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    another_category.is_published = False
+    another_category.save()
+    mixer.blend(
+        Post, author=user, category=another_category, is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    content = client.get("/").content.decode("utf-8")
+    assert f"/category/{published_category.slug}/" in content
+    assert f"/posts/{post.id}/" in content
+    assert f"/category/{another_category.slug}/" not in content, (
+        "Убедитесь, что в боковой колонке главной страницы не показаны"
+        " снятые с публикации категории."
+    )
+
+
+def test_summary_is_cached(mixer, user, published_category):
+    mixer.blend(Post, author=user, category=published_category)
+    category_summary()
+    with CaptureQueriesContext(connection) as ctx:
+        category_summary()
+    assert not ctx.captured_queries
+
+    mixer.blend(Post, author=user, category=published_category)
+    with CaptureQueriesContext(connection) as ctx:
+        category_summary()
+    assert ctx.captured_queries, (
+        "Убедитесь, что сводка категорий обновляется после добавления"
+        " публикации."
+    )
+
+
+def test_recount_counters_repairs_stats(mixer, user, published_category):
+    mixer.cycle(2).blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    CategoryStats.objects.update(post_count=42, latest_post=None)
+    call_command("recount_counters", stdout=StringIO())
+    assert stored(published_category)["post_count"] == 2
+    assert stored(published_category)["latest_post"] is not None
@@ -0,0 +1,101 @@
+import pytest
+from django.urls import reverse
+
+from blog.models import Comment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def page_urls(post_with_published_location, published_category, user):
+    return {
+        "index": reverse("blog:index"),
+        "category": reverse(
+            "blog:category_posts", args=(published_category.slug,)
+        ),
+        "profile": reverse("blog:profile", args=(user.username,)),
+        "detail": reverse(
+            "blog:post_detail", args=(post_with_published_location.id,)
+        ),
+    }
+
+
+def revalidate(client, url, response):
+    return client.get(
+        url,
+        HTTP_IF_NONE_MATCH=response["ETag"],
+        HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+    )
+
+
+@pytest.mark.parametrize("page", ["index", "category", "profile", "detail"])
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_unchanged_page_is_not_modified(
+        request, page, client_name, page_urls
+):
+    client = request.getfixturevalue(client_name)
+    url = page_urls[page]
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"
+    ), f"Убедитесь, что страница `{url}` отдаёт ETag и Last-Modified."
+
+    repeat = revalidate(client, url, response)
+    assert repeat.status_code == 304, (
+        f"Убедитесь, что при повторном запросе неизменённой страницы `{url}` "
+        "возвращается ответ 304."
+    )
+    assert not repeat.content
+    assert repeat["ETag"] == response["ETag"]
+
+
+@pytest.mark.parametrize("page", ["index", "category", "profile", "detail"])
+def test_new_comment_changes_validators(
+        client, page, page_urls, post_with_published_location, user
+):
+    url = page_urls[page]
+    response = client.get(url)
+    Comment.objects.create(
+        post=post_with_published_location, author=user, text="Новый"
+    )
+    repeat = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert repeat.status_code == 200, (
+        f"Убедитесь, что после нового комментария страница `{url}` "
+        "отдаётся заново."
+    )
+
+
+def test_validators_differ_per_user(client, user_client, page_urls):
+    anonymous = client.get(page_urls["detail"])
+    logged_in = user_client.get(page_urls["detail"])
+    assert anonymous["ETag"] != logged_in["ETag"], (
+        "Убедитесь, что ETag учитывает пользователя, для которого "
+        "отрисована страница."
+    )
+    assert user_client.get(
+        page_urls["detail"], HTTP_IF_NONE_MATCH=anonymous["ETag"]
+    ).status_code == 200
+
+
+def test_not_modified_skips_rendering(client, page_urls):
+    url = page_urls["index"]
+    response = client.get(url)
+    client.get(url)
+    repeat = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert repeat.status_code == 304
+    assert not getattr(repeat, "templates", None), (
+        "Убедитесь, что ответ 304 формируется без отрисовки шаблона."
+    )
+
+
+def test_new_login_changes_validators(client, user, page_urls):
+    url = page_urls["detail"]
+    client.force_login(user)
+    response = client.get(url)
+    client.logout()
+    client.force_login(user)
+    assert revalidate(client, url, response).status_code == 200, (
+        "Убедитесь, что после повторного входа страница с формой "
+        "отдаётся заново: в ней новый CSRF-токен."
+    )
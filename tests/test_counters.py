@@ -0,0 +1,69 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comment_views(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for i in range(2):
+        user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": f"comment {i}"}
+        )
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что добавление комментария увеличивает счётчик"
+        " `comment_count` публикации."
+    )
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что удаление комментария уменьшает счётчик"
+        " `comment_count` публикации."
+    )
+
+
+def test_comment_count_follows_moved_comment(
+        mixer, post_with_published_location, post_of_another_author
+):
+    comment = mixer.blend(Comment, post=post_with_published_location)
+    comment.post = post_of_another_author
+    comment.save()
+    counts = dict(Post.objects.values_list("id", "comment_count"))
+    assert counts[post_with_published_location.id] == 0
+    assert counts[post_of_another_author.id] == 1
+
+
+def test_recount_counters_repairs_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comment, post=post)
+    Post.objects.update(comment_count=42)
+    call_command("recount_counters", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что команда `recount_counters` пересчитывает"
+        " `comment_count` по таблице комментариев."
+    )
+
+
+def test_post_save_keeps_concurrent_comment_count(
+        mixer, post_with_published_location
+):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    mixer.cycle(2).blend(Comment, post=post)
+    post.title = "Отредактированный заголовок"
+    post.save()
+    post.refresh_from_db()
+    assert post.title == "Отредактированный заголовок"
+    assert post.comment_count == 2, (
+        "Убедитесь, что сохранение публикации не перезаписывает счётчик"
+        " комментариев, увеличенный после её загрузки."
+    )
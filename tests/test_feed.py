@@ -0,0 +1,272 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import cache as blog_cache
+from blog.checks import check_shared_cache
+from blog.management.commands import activate_scheduled
+from blog.scheduling import activate_scheduled_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduled_post_appears_when_activated(
+        mixer, user, another_user_client, published_category
+):
+    pub_date = timezone.now() + timedelta(minutes=5)
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=pub_date,
+    )
+    response = another_user_client.get("/")
+    assert post not in response.context["page_obj"], (
+        "Убедитесь, что отложенная публикация не видна до даты публикации."
+    )
+    assert another_user_client.get(f"/posts/{post.id}/").status_code == 404
+
+    assert activate_scheduled_posts() == [], (
+        "Убедитесь, что публикация не показывается раньше своей даты."
+    )
+    assert activate_scheduled_posts(pub_date) == [post.id]
+    response = another_user_client.get("/")
+    assert post in response.context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется в ленте после"
+        " наступления даты публикации без перезапуска сервера."
+    )
+    assert another_user_client.get(f"/posts/{post.id}/").status_code == 200
+
+
+def test_activation_invalidates_cached_feeds(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(minutes=5),
+    )
+    urls = (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    )
+    for url in urls:
+        assert post.title not in client.get(url).content.decode()
+    activate_scheduled_posts(post.pub_date)
+    for url in urls:
+        assert post.title in client.get(url).content.decode(), (
+            f"Убедитесь, что показ отложенной публикации сбрасывает кэш "
+            f"`{url}`."
+        )
+
+
+def test_activation_in_another_process_reaches_cached_pages(
+        client, monkeypatch, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(minutes=5),
+    )
+    assert post.title not in client.get("/").content.decode()
+
+    # activate_scheduled runs with its own connection to the cache.
+    monkeypatch.setattr(blog_cache, "versions_cache", (
+        caches.create_connection("versions")
+    ))
+    activate_scheduled_posts(post.pub_date)
+    monkeypatch.undo()
+    content = client.get("/").content.decode()
+    assert content.count(post.title) == 2, (
+        "Убедитесь, что сброс кэша командой `activate_scheduled` виден"
+        " веб-процессам: и лента, и список категорий показывают пост."
+    )
+
+
+def test_activate_scheduled_command(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(minutes=5),
+    )
+    command = activate_scheduled.Command(stdout=StringIO())
+    assert 0 < command.delay(600) <= 300, (
+        "Убедитесь, что команда `activate_scheduled` просыпается к дате"
+        " ближайшей отложенной публикации."
+    )
+    type(post).objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    call_command("activate_scheduled", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.is_visible
+    assert command.delay(600) == 600
+
+
+def test_feed_query_is_an_equality_lookup(
+        another_user_client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as ctx:
+        another_user_client.get("/")
+    feed_queries = [
+        query["sql"] for query in ctx.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert feed_queries and not any(
+        '"blog_post"."pub_date" <=' in sql for sql in feed_queries
+    ), (
+        "Убедитесь, что запрос ленты не сравнивает дату публикации"
+        " с текущим временем."
+    )
+
+
+def test_anonymous_feed_pages_are_cached(
+        client, django_assert_num_queries, user,
+        post_with_published_location
+):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+    )
+    for url in urls:
+        first = client.get(url)
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.content == first.content, (
+            f"Убедитесь, что анонимный запрос `{url}` отдаётся из кэша."
+        )
+
+
+def test_feed_cache_is_invalidated_on_changes(
+        client, mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+    )
+    for url in urls:
+        client.get(url)
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+    for url in urls:
+        assert "Обновлённый заголовок" in client.get(url).content.decode(), (
+            f"Убедитесь, что изменение публикации сбрасывает кэш `{url}`."
+        )
+
+    mixer.blend("blog.Comment", post=post)
+    for url in urls:
+        assert "Комментарии (1)" in client.get(url).content.decode(), (
+            f"Убедитесь, что новый комментарий сбрасывает кэш `{url}`."
+        )
+
+    post.location.name = "Новое место"
+    post.location.save()
+    for url in urls:
+        assert "Новое место" in client.get(url).content.decode(), (
+            f"Убедитесь, что изменение местоположения сбрасывает кэш `{url}`."
+        )
+
+
+def test_invalidation_reaches_other_processes(
+        client, monkeypatch, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    type(post).objects.filter(pk=post.pk).update(title="Из другого процесса")
+
+    # A worker process has its own connection to the versions cache.
+    monkeypatch.setattr(blog_cache, "versions_cache", (
+        caches.create_connection("versions")
+    ))
+    blog_cache.invalidate_feeds(blog_cache.INDEX_SCOPE)
+    monkeypatch.undo()
+    assert "Из другого процесса" in client.get("/").content.decode(), (
+        "Убедитесь, что сброс кэша лент в одном процессе виден остальным:"
+        " кэш по умолчанию должен быть общим для процессов."
+    )
+
+
+def test_process_local_cache_is_reported(settings):
+    settings.CACHES = {**settings.CACHES, "versions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}
+    assert [error.id for error in check_shared_cache(None)] == [
+        "blog.W001"
+    ], "Убедитесь, что кэш, не общий для процессов, вызывает предупреждение."
+    del settings.CACHES["versions"]
+    assert [error.id for error in check_shared_cache(None)] == [
+        "blog.E001"
+    ], "Убедитесь, что отсутствие кэша версий считается ошибкой."
+
+
+def test_page_cache_culling_keeps_versions(settings, monkeypatch):
+    settings.CACHES = {**settings.CACHES, "default": {
+        **settings.CACHES["default"],
+        "OPTIONS": {"MAX_ENTRIES": 5, "CULL_FREQUENCY": 0},
+    }}
+    blog_cache.invalidate_feeds(blog_cache.INDEX_SCOPE)
+    versions = blog_cache.feed_versions(blog_cache.INDEX_SCOPE)
+    pages = caches["default"]
+    listings = []
+    monkeypatch.setattr(
+        pages, "_list_cache_files",
+        lambda original=pages._list_cache_files: listings.append(1)
+        or original(),
+    )
+    for number in range(20):
+        pages.set(f"page-{number}", number)
+    assert len(listings) == 1, (
+        "Убедитесь, что файловый кэш не перечисляет каталог при каждой"
+        " записи."
+    )
+    pages._culled_at = None
+    pages.set("page-last", "last")
+    assert pages.get("page-0") is None
+    assert blog_cache.feed_versions(blog_cache.INDEX_SCOPE) == versions, (
+        "Убедитесь, что вытеснение страниц из кэша не удаляет версии лент."
+    )
+
+
+def test_authenticated_feed_is_not_cached(
+        user_client, post_with_published_location
+):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.get("/")
+    assert ctx.captured_queries, (
+        "Убедитесь, что страницы авторизованных пользователей не кэшируются."
+    )
+
+
+def test_post_card_fragment_follows_version_stamp(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+
+    type(post).objects.filter(pk=post.pk).update(title="Без нового штампа")
+    assert "Без нового штампа" not in user_client.get("/").content.decode(), (
+        "Убедитесь, что карточка публикации берётся из кэша фрагментов."
+    )
+
+    post.refresh_from_db()
+    post.save()
+    assert "Без нового штампа" in user_client.get("/").content.decode(), (
+        "Убедитесь, что сохранение публикации меняет штамп версии карточки."
+    )
+
+    post.category.title = "Переименованная категория"
+    post.category.save()
+    assert "Переименованная категория" in user_client.get(
+        "/"
+    ).content.decode(), (
+        "Убедитесь, что изменение категории меняет штамп версии карточки."
+    )
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+pytestmark = pytest.mark.django_db
+
+FEEDS = [
+    ("blog:feed_rss", None, "application/rss+xml"),
+    ("blog:feed_atom", None, "application/atom+xml"),
+    ("blog:category_feed_rss", "category", "application/rss+xml"),
+    ("blog:category_feed_atom", "category", "application/atom+xml"),
+    ("blog:profile_feed_rss", "profile", "application/rss+xml"),
+    ("blog:profile_feed_atom", "profile", "application/atom+xml"),
+]
+
+
+@pytest.fixture
+def feed_url(published_category, user):
+    def build(name, kind):
+        args = {
+            None: (),
+            "category": (published_category.slug,),
+            "profile": (user.username,),
+        }[kind]
+        return reverse(name, args=args)
+
+    return build
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category, published_location):
+    def blend(title, **kwargs):
+        fields = {
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **kwargs,
+        }
+        return mixer.blend(
+            "blog.Post", title=title, author=user,
+            category=published_category, location=published_location,
+            **fields,
+        )
+
+    return {
+        "published": blend("Опубликованный пост"),
+        "draft": blend("Черновик", is_published=False),
+        "scheduled": blend(
+            "Отложенный пост", pub_date=timezone.now() + timedelta(days=1)
+        ),
+    }
+
+
+@pytest.mark.parametrize("name,kind,content_type", FEEDS)
+def test_feed_lists_visible_posts(
+        client, feed_url, feed_posts, name, kind, content_type
+):
+    response = client.get(feed_url(name, kind))
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith(content_type)
+    content = response.content.decode()
+    assert "Опубликованный пост" in content, (
+        "Убедитесь, что лента содержит опубликованные посты."
+    )
+    assert "Черновик" not in content and "Отложенный пост" not in content, (
+        "Убедитесь, что в ленту не попадают снятые с публикации и "
+        "отложенные посты."
+    )
+
+
+@pytest.mark.parametrize("name,kind,content_type", FEEDS[:4:2])
+def test_feed_is_cached_and_revalidated(
+        client, feed_url, feed_posts, name, kind, content_type,
+        django_assert_num_queries
+):
+    url = feed_url(name, kind)
+    response = client.get(url)
+    with django_assert_num_queries(0):
+        repeat = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert repeat.status_code == 304, (
+        "Убедитесь, что неизменённая лента отдаётся из кэша с ответом 304."
+    )
+
+    draft = feed_posts["draft"]
+    draft.is_published = True
+    draft.save()
+    updated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert updated.status_code == 200
+    assert "Черновик" in updated.content.decode(), (
+        "Убедитесь, что публикация поста сбрасывает кэш ленты."
+    )
+
+
+def test_feed_rebuild_does_not_depend_on_history(
+        client, settings, mixer, user, published_category
+):
+    settings.SYNDICATION_FEED_SIZE = 3
+    url = reverse("blog:feed_rss")
+
+    def rebuild_queries(posts):
+        def blend(count):
+            mixer.cycle(count).blend(
+                "blog.Post", author=user, category=published_category,
+                is_published=True,
+                pub_date=timezone.now() - timedelta(days=1),
+            )
+
+        blend(posts)
+        client.get(url)
+        blend(1)
+        with CaptureQueriesContext(connection) as ctx:
+            content = client.get(url).content.decode()
+        assert content.count("<item>") == 3
+        return len(ctx.captured_queries)
+
+    assert rebuild_queries(3) == rebuild_queries(30), (
+        "Убедитесь, что пересборка ленты после публикации читает только"
+        " последние записи, а не всю историю."
+    )
+
+
+def test_unpublished_category_feed_is_not_found(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    url = reverse("blog:category_feed_rss", args=(category.slug,))
+    assert client.get(url).status_code == 404
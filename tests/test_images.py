@@ -0,0 +1,74 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.files.images import ImageFile
+
+from core.tasks import run_pending_tasks
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_large_image(
+        mixer, user, published_location, published_category
+):
+    img_io = BytesIO()
+    Image.new("RGB", (2000, 1000), color=(73, 109, 137)).save(
+        img_io, format="JPEG"
+    )
+    post = mixer.blend(
+        "blog.Post",
+        is_published=True,
+        location=published_location,
+        category=published_category,
+        author=user,
+        image=ImageFile(img_io, name="large_image.jpg"),
+    )
+    run_pending_tasks()
+    return post
+
+
+def test_derivatives_generated_on_upload(post_with_large_image):
+    post = post_with_large_image
+    post.refresh_from_db()
+    variants = post.image_variants["variants"]
+    assert post.image_variants["source"] == post.image.name
+    assert {
+        (variant["width"], variant["type"]) for variant in variants
+    } == {
+        (width, mime_type)
+        for width in (320, 640, 1280)
+        for mime_type in ("image/webp", "image/jpeg")
+    }, (
+        "Убедитесь, что при загрузке изображения создаются уменьшенные"
+        " копии в форматах WebP и JPEG."
+    )
+    storage = post.image.storage
+    for variant in variants:
+        with storage.open(variant["name"]) as fh:
+            derivative = Image.open(fh)
+            assert derivative.size == (variant["width"], variant["height"])
+        assert storage.size(variant["name"]) < storage.size(post.image.name)
+
+
+def test_feed_serves_derivatives(user_client, post_with_large_image):
+    post = post_with_large_image
+    post.refresh_from_db()
+    content = user_client.get("/").content.decode()
+    assert 'type="image/webp"' in content and "srcset=" in content, (
+        "Убедитесь, что в ленте изображения публикаций отдаются через"
+        " `srcset` уменьшенных копий."
+    )
+    assert f'src="{post.image.url}"' not in content, (
+        "Убедитесь, что в ленте не встраивается оригинал изображения."
+    )
+
+
+def test_derivatives_removed_with_post(post_with_large_image):
+    post = post_with_large_image
+    post.refresh_from_db()
+    storage = post.image.storage
+    names = [variant["name"] for variant in post.image_variants["variants"]]
+    post.delete()
+    assert not any(storage.exists(name) for name in names)
@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="`EXPLAIN QUERY PLAN` is SQLite-specific",
+    ),
+]
+
+
+def get_feed_query_plan(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    feed_queries = [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "blog_post"' in query["sql"]
+    ]
+    assert feed_queries, f"Не найден запрос ленты для `{url}`."
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {feed_queries[-1]}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@pytest.fixture
+def posts_in_several_categories(mixer, user, published_category):
+    categories = [published_category, *mixer.cycle(3).blend(
+        "blog.Category", is_published=True
+    )]
+    mixer.blend("blog.Category", is_published=False)
+    return mixer.cycle(40).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category=mixer.sequence(*categories),
+    )
+
+
+@pytest.mark.parametrize(
+    "url_template",
+    ["/", "/category/{category_slug}/", "/profile/{username}/"],
+    ids=["index", "category", "profile"],
+)
+def test_feed_queries_use_index(
+        url_template, another_user_client, user,
+        posts_in_several_categories, published_category
+):
+    url = url_template.format(
+        category_slug=published_category.slug, username=user.username
+    )
+    plan = get_feed_query_plan(another_user_client, url)
+    post_steps = [step for step in plan if "blog_post" in step]
+    assert post_steps and all(
+        "USING INDEX" in step or "USING COVERING INDEX" in step
+        for step in post_steps
+    ), (
+        f"Убедитесь, что запрос ленты `{url}` читает публикации по индексу,"
+        f" а не полным сканированием таблицы: {plan}"
+    )
+    assert not any("TEMP B-TREE" in step for step in plan), (
+        f"Убедитесь, что запрос ленты `{url}` не сортирует результат во"
+        f" временном B-дереве: {plan}"
+    )
+
+
+def test_comment_pages_use_index(
+        user_client, settings, mixer, post_with_published_location
+):
+    settings.COMMENTS_PAGINATION_SIZE = 5
+    post = post_with_published_location
+    mixer.cycle(12).blend("blog.Comment", post=post)
+    first = user_client.get(f"/posts/{post.id}/")
+    cursor = first.context["comments"].next_cursor
+    for url in (
+        f"/posts/{post.id}/",
+        f"/posts/{post.id}/comments/?cursor={cursor}",
+    ):
+        with CaptureQueriesContext(connection) as ctx:
+            assert user_client.get(url).status_code == 200
+        comment_queries = [
+            query["sql"] for query in ctx.captured_queries
+            if query["sql"].startswith("SELECT")
+            and 'FROM "blog_comment"' in query["sql"]
+        ]
+        assert comment_queries, f"Не найден запрос комментариев для `{url}`."
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(f"EXPLAIN QUERY PLAN {comment_queries[-1]}")
+            plan = [row[-1] for row in db_cursor.fetchall()]
+        assert any("comment_post_created_idx" in step for step in plan), (
+            f"Убедитесь, что комментарии `{url}` читаются по индексу "
+            f"(post, created_at, id): {plan}"
+        )
+        assert not any("TEMP B-TREE" in step for step in plan), (
+            f"Убедитесь, что страница комментариев `{url}` не сортирует все "
+            f"комментарии поста во временном B-дереве: {plan}"
+        )
@@ -0,0 +1,108 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.lookups import VERSION_KEY, LookupTables, lookup_tables
+
+pytestmark = pytest.mark.django_db
+
+
+def test_feed_does_not_join_lookup_tables(
+        client, post_with_published_location
+):
+    lookup_tables.refresh()
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse("blog:index"))
+    assert post_with_published_location in response.context["page_obj"]
+    for query in ctx.captured_queries:
+        assert '"blog_category"' not in query["sql"], (
+            "Убедитесь, что категории берутся из кэша справочников, "
+            "а не присоединяются к запросу ленты."
+        )
+        assert "blog_location" not in query["sql"]
+    content = response.content.decode()
+    assert post_with_published_location.category.title in content
+    assert post_with_published_location.location.name in content
+
+
+def test_saved_category_is_seen_at_once(
+        client, post_with_published_location
+):
+    category = post_with_published_location.category
+    url = reverse("blog:category_posts", args=(category.slug,))
+    assert client.get(url).status_code == 200
+
+    category.is_published = False
+    category.save()
+    assert client.get(url).status_code == 404, (
+        "Убедитесь, что кэш справочников сбрасывается при сохранении "
+        "категории."
+    )
+    response = client.get(reverse("blog:index"))
+    assert post_with_published_location not in response.context["page_obj"]
+
+
+def test_other_processes_reload_on_next_request(published_category):
+    other_process = LookupTables()
+    assert other_process.category(published_category.pk).title == (
+        published_category.title
+    )
+
+    published_category.title = "Новое название"
+    published_category.save()
+    assert other_process.category(published_category.pk).title != (
+        "Новое название"
+    ), "Копия справочников сверяется с версией один раз за запрос."
+
+    other_process.expire()
+    assert other_process.category(published_category.pk).title == (
+        "Новое название"
+    ), (
+        "Убедитесь, что другие процессы перечитывают справочники после "
+        "изменения категории."
+    )
+
+
+def test_version_bumped_through_another_cache_is_seen(published_category):
+    tables = LookupTables()
+    assert tables.category(published_category.pk).title == (
+        published_category.title
+    )
+    type(published_category).objects.filter(
+        pk=published_category.pk
+    ).update(title="Новое название")
+
+    # The process that saved the category has its own cache connection.
+    caches.create_connection("versions").set(
+        VERSION_KEY, "из другого процесса", timeout=None
+    )
+    tables.expire()
+    assert tables.category(published_category.pk).title == (
+        "Новое название"
+    ), (
+        "Убедитесь, что версия справочников хранится в кэше, общем для"
+        " всех процессов."
+    )
+
+
+def test_tables_without_requests_are_rechecked(
+        settings, published_category
+):
+    tables = LookupTables()
+    tables.category(published_category.pk)
+    type(published_category).objects.filter(
+        pk=published_category.pk
+    ).update(title="Новое название")
+    caches.create_connection("versions").set(
+        VERSION_KEY, "из другого процесса", timeout=None
+    )
+
+    settings.LOOKUP_TABLES_MAX_AGE = 0
+    assert tables.category(published_category.pk).title == (
+        "Новое название"
+    ), (
+        "Убедитесь, что процессы без запросов (runworker, команды)"
+        " сверяют версию справочников не реже `LOOKUP_TABLES_MAX_AGE`."
+    )
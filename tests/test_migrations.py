@@ -0,0 +1,36 @@
+import ast
+from pathlib import Path
+
+import pytest
+from django.apps import apps
+
+PROJECT_APPS = ("blog", "core", "pages", "blogicum")
+
+
+def project_migrations():
+    for label in ("blog", "core"):
+        path = Path(apps.get_app_config(label).path) / "migrations"
+        yield from sorted(path.glob("[0-9]*.py"))
+
+
+def imported_modules(path):
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            yield node.module or ""
+
+
+@pytest.mark.parametrize(
+    "path", list(project_migrations()), ids=lambda path: path.name
+)
+def test_migrations_do_not_import_app_code(path):
+    app_imports = [
+        module for module in imported_modules(path)
+        if module.split(".")[0] in PROJECT_APPS
+    ]
+    assert not app_imports, (
+        f"Убедитесь, что миграция `{path.name}` не импортирует код "
+        f"приложений ({', '.join(app_imports)}): миграция должна "
+        "работать одинаково и после изменения этого кода."
+    )
@@ -0,0 +1,192 @@
+import sqlite3
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import (
+    AuthorStats, CategoryStats, Comment, ModerationAction, Post
+)
+from blog.search import SEARCH_TABLE, search_available
+from test_admin import insert_rows
+
+pytestmark = [pytest.mark.django_db]
+
+POSTS_URL = "/admin/blog/post/"
+COMMENTS_URL = "/admin/blog/comment/"
+
+
+@pytest.fixture
+def make_posts(mixer, user, published_category, published_location):
+    def make(count):
+        return mixer.cycle(count).blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location,
+        )
+    return make
+
+
+def run_action(client, url, action, objects, **data):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(url, {
+            "action": action,
+            "_selected_action": [obj.pk for obj in objects],
+            **data,
+        })
+    assert response.status_code == 302
+    return len(ctx.captured_queries)
+
+
+def test_query_count_does_not_depend_on_selection(admin_client, make_posts):
+    few = run_action(admin_client, POSTS_URL, "unpublish_posts", make_posts(2))
+    many = run_action(
+        admin_client, POSTS_URL, "unpublish_posts", make_posts(50)
+    )
+    assert many == few, (
+        "Убедитесь, что массовое действие выполняется одинаковым числом "
+        "запросов независимо от числа выбранных публикаций."
+    )
+    assert not Post.objects.filter(is_published=True).exists()
+
+
+def test_delete_runs_no_per_row_bookkeeping(admin_client, mixer, make_posts):
+    def delete(count):
+        posts = make_posts(count)
+        for post in posts:
+            mixer.blend("blog.Comment", post=post)
+        return run_action(admin_client, POSTS_URL, "delete_posts", posts)
+
+    assert delete(50) == delete(2), (
+        "Убедитесь, что массовое удаление не выполняет запросы для "
+        "каждой удаляемой публикации и каждого комментария."
+    )
+
+
+def test_delete_posts_clears_references(
+        admin_client, user, published_category, make_posts
+):
+    posts = make_posts(2)
+    stats = CategoryStats.objects.get(category=published_category)
+    assert stats.latest_post_id in {post.pk for post in posts}
+    run_action(admin_client, POSTS_URL, "delete_posts", posts)
+    stats.refresh_from_db()
+    assert stats.latest_post is None and stats.post_count == 0, (
+        "Убедитесь, что ссылки на удалённые публикации обнуляются."
+    )
+    assert AuthorStats.objects.get(author=user).post_count == 0
+
+
+def test_unpublish_invalidates_cached_feed(admin_client, client, make_posts):
+    posts = make_posts(3)
+    assert len(client.get("/").context["page_obj"]) == 3
+    run_action(admin_client, POSTS_URL, "unpublish_posts", posts[:2])
+    assert len(client.get("/").context["page_obj"]) == 1, (
+        "Убедитесь, что после массового снятия с публикации закэшированная "
+        "лента обновляется."
+    )
+    run_action(admin_client, POSTS_URL, "publish_posts", posts[:2])
+    assert len(client.get("/").context["page_obj"]) == 3
+
+
+def test_move_posts(admin_client, client, make_posts, another_category):
+    posts = make_posts(2)
+    url = f"/category/{another_category.slug}/"
+    assert not client.get(url).context["page_obj"]
+    run_action(
+        admin_client, POSTS_URL, "move_posts", posts,
+        category=another_category.pk,
+    )
+    assert set(Post.objects.values_list("category", flat=True)) == {
+        another_category.pk
+    }
+    assert len(client.get(url).context["page_obj"]) == 2
+    record = ModerationAction.objects.get()
+    assert record.action == ModerationAction.MOVE
+    assert record.details == {"category": another_category.slug}
+
+
+def test_move_posts_requires_category(admin_client, make_posts):
+    posts = make_posts(1)
+    run_action(admin_client, POSTS_URL, "move_posts", posts)
+    assert not ModerationAction.objects.exists()
+
+
+def test_delete_posts(admin_client, admin_user, mixer, make_posts):
+    posts = make_posts(3)
+    mixer.cycle(4).blend("blog.Comment", post=posts[0])
+    run_action(admin_client, POSTS_URL, "delete_posts", posts[:2])
+    assert list(Post.objects.all()) == [posts[2]]
+    assert not Comment.objects.exists()
+    if search_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT rowid FROM {SEARCH_TABLE}")
+            assert [row[0] for row in cursor.fetchall()] == [posts[2].pk]
+
+    record = ModerationAction.objects.get()
+    assert record.moderator == admin_user
+    assert record.target == "blog.post"
+    assert sorted(record.object_ids) == sorted(p.pk for p in posts[:2])
+    assert record.object_count == 2
+
+
+def test_delete_comments_recounts(admin_client, mixer, make_posts):
+    post = make_posts(1)[0]
+    comments = mixer.cycle(5).blend("blog.Comment", post=post)
+    run_action(admin_client, COMMENTS_URL, "delete_comments", comments[:3])
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что после массового удаления комментариев счётчик "
+        "комментариев пересчитывается."
+    )
+    assert ModerationAction.objects.get().target == "blog.comment"
+
+
+def test_stock_delete_action_removed(admin_client):
+    content = admin_client.get(POSTS_URL).content.decode("utf-8")
+    assert "delete_selected" not in content
+    assert "delete_posts" in content
+
+
+@pytest.fixture
+def parameter_limit():
+    """Lower the bound parameter limit to the SQLite default before 3.32."""
+    connection.ensure_connection()
+    raw = connection.connection
+    limit = raw.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    raw.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+    yield 999
+    raw.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, limit)
+
+
+def test_select_all_on_a_large_changelist(
+        admin_client, user, published_category, published_location,
+        parameter_limit
+):
+    n_rows = parameter_limit * 3
+    now = timezone.now()
+    insert_rows(
+        n_rows, "blog_post",
+        ("is_published", "is_visible", "created_at", "updated_at", "title",
+         "text", "pub_date", "author_id", "category_id", "location_id",
+         "image_variants", "comment_count"),
+        ("1", "1", "%s", "%s", "'title ' || n", "'text'", "%s", "%s", "%s",
+         "%s", "'{}'", "0"),
+        [now, now, now, user.id, published_category.id,
+         published_location.id],
+    )
+    for action in ("unpublish_posts", "delete_posts"):
+        response = admin_client.post(POSTS_URL, {
+            "action": action,
+            "select_across": "1",
+            "_selected_action": [Post.objects.first().pk],
+        })
+        assert response.status_code == 302
+        assert ModerationAction.objects.filter(
+            object_count=n_rows
+        ).count() == 1, (
+            "Убедитесь, что массовое действие над всеми строками большого "
+            "списка не упирается в ограничение числа параметров запроса."
+        )
+        ModerationAction.objects.all().delete()
+    assert not Post.objects.exists()
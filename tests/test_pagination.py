@@ -0,0 +1,124 @@
+import base64
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_keyset_pagination_walks_all_posts(
+        user_client, many_posts_with_published_locations
+):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    seen = []
+    cursor_pages = []
+    url = "/"
+    while url:
+        response = user_client.get(url)
+        page_obj = response.context["page_obj"]
+        assert len(page_obj) <= N_PER_PAGE, (
+            "Убедитесь, что на странице не больше публикаций, чем задано "
+            "настройкой `PAGINATION_SIZE`."
+        )
+        seen.extend(page_obj)
+        cursor_pages.append((url, [post.id for post in page_obj]))
+        url = (
+            f"/?cursor={page_obj.next_cursor}"
+            if page_obj.has_next() else None
+        )
+    assert [post.id for post in seen] == [post.id for post in expected], (
+        "Убедитесь, что переход по курсору `next` обходит все публикации "
+        "без пропусков и повторов, «от новых к старым»."
+    )
+
+    last_page = user_client.get(cursor_pages[-1][0]).context["page_obj"]
+    previous = user_client.get(
+        f"/?cursor={last_page.previous_cursor}"
+    ).context["page_obj"]
+    assert [post.id for post in previous] == cursor_pages[-2][1], (
+        "Убедитесь, что курсор `previous` возвращает на предыдущую страницу."
+    )
+
+
+def test_keyset_pagination_skips_count(
+        user_client, many_posts_with_published_locations
+):
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.get("/")
+    assert not any(
+        "COUNT(*)" in query["sql"] for query in ctx.captured_queries
+    ), (
+        "Убедитесь, что курсорная пагинация не выполняет `COUNT(*)`."
+    )
+
+
+def encode(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode(["n", "2024-01-01T00:00:00+00:00", "abc"]),
+    encode(["n", [1], {}]),
+    encode(["n", "2024-01-01T00:00:00+00:00", None]),
+    encode(["n", "вчера", 1]),
+])
+def test_keyset_pagination_bad_cursor(user_client, cursor):
+    response = user_client.get("/", {"cursor": cursor})
+    assert response.status_code == 404, (
+        "Убедитесь, что для некорректного курсора возвращается ошибка 404."
+    )
+
+
+def test_comments_are_paginated(
+        settings, user_client, mixer, post_with_published_location
+):
+    settings.COMMENTS_PAGINATION_SIZE = 5
+    post = post_with_published_location
+    comments = mixer.cycle(12).blend("blog.Comment", post=post)
+    expected_ids = [comment.id for comment in comments]
+
+    response = user_client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    seen = [comment.id for comment in page]
+    assert seen == expected_ids[:5], (
+        "Убедитесь, что на странице публикации выводится только первая"
+        " порция комментариев, «от старых к новым»."
+    )
+    url = f"/posts/{post.id}/comments/?cursor={page.next_cursor}"
+    assert url.split("?")[0] in response.content.decode()
+
+    while page.has_next():
+        response = user_client.get(
+            f"/posts/{post.id}/comments/?cursor={page.next_cursor}"
+        )
+        assert response.status_code == 200
+        assert "<html" not in response.content.decode(), (
+            "Убедитесь, что следующая порция комментариев отдаётся"
+            " HTML-фрагментом без базового шаблона."
+        )
+        page = response.context["comments"]
+        seen.extend(comment.id for comment in page)
+    assert seen == expected_ids, (
+        "Убедитесь, что подгрузка комментариев обходит их все без пропусков."
+    )
+
+
+def test_comments_fragment_respects_post_visibility(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404, (
+        "Убедитесь, что комментарии недоступной публикации не отдаются."
+    )
@@ -0,0 +1,47 @@
+import pytest
+
+from blog.lookups import lookup_tables
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_location, published_category):
+    return mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+
+
+@pytest.mark.parametrize(
+    ("url_template", "expected_queries"),
+    [
+        ("/", 4),
+        ("/category/{category_slug}/", 3),
+        ("/profile/{username}/", 4),
+        ("/posts/{post_id}/", 4),
+        ("/posts/{post_id}/comments/", 4),
+        ("/posts/{post_id}/edit/", 5),
+        ("/posts/{post_id}/delete/", 3),
+    ],
+    ids=[
+        "index", "category", "profile", "detail", "comments",
+        "edit post", "delete post",
+    ],
+)
+def test_view_query_count(
+        url_template, expected_queries, user, user_client,
+        django_assert_num_queries, feed_posts, published_category
+):
+    post = feed_posts[0]
+    url = url_template.format(
+        category_slug=published_category.slug,
+        username=user.username,
+        post_id=post.id,
+    )
+    lookup_tables.refresh()
+    with django_assert_num_queries(expected_queries):
+        response = user_client.get(url)
+    assert response.status_code == 200
@@ -0,0 +1,72 @@
+import pytest
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from blog.models import Post
+from core import routers
+from core.routers import ReplicaRouter, replica_reads
+
+
+@override_settings(READ_REPLICAS=["replica_1", "replica_2"])
+def test_router_sends_only_marked_reads_to_replicas():
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) == "default", (
+        "Убедитесь, что чтение вне представлений для чтения идёт в основную "
+        "базу."
+    )
+    with replica_reads():
+        assert router.db_for_read(Post) in ("replica_1", "replica_2"), (
+            "Убедитесь, что чтение в представлениях для чтения идёт в "
+            "реплику."
+        )
+        assert router.db_for_write(Post) == "default", (
+            "Убедитесь, что запись всегда идёт в основную базу."
+        )
+    assert not router.allow_migrate("replica_1", "blog")
+    assert router.allow_migrate("default", "blog")
+
+
+def test_router_falls_back_to_primary_without_replicas():
+    with replica_reads():
+        assert ReplicaRouter().db_for_read(Post) == "default"
+
+
+@pytest.fixture
+def read_log(monkeypatch):
+    log = []
+    original = ReplicaRouter.db_for_read
+
+    def logged(self, model, **hints):
+        log.append(routers._replica_reads.get())
+        return original(self, model, **hints)
+
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", logged)
+    return log
+
+
+@pytest.mark.django_db
+def test_feed_reads_replica_until_client_writes(
+        read_log, user_client, post_with_published_location
+):
+    detail_url = reverse(
+        "blog:post_detail", args=(post_with_published_location.id,)
+    )
+    read_log.clear()
+    user_client.get(detail_url)
+    assert read_log and all(read_log), (
+        "Убедитесь, что страница поста читает данные из реплики."
+    )
+
+    user_client.post(
+        reverse("blog:add_comment", args=(post_with_published_location.id,)),
+        data={"text": "Новый комментарий"},
+    )
+    assert settings.REPLICA_PIN_COOKIE in user_client.cookies
+
+    read_log.clear()
+    user_client.get(detail_url)
+    assert read_log and not any(read_log), (
+        "Убедитесь, что после отправки формы клиент читает свои изменения "
+        "из основной базы."
+    )
@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog import search as blog_search
+from blog.search import search_available
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def search_posts(mixer, user, published_category, published_location):
+    def blend(title, text, **kwargs):
+        fields = {
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **kwargs,
+        }
+        return mixer.blend(
+            "blog.Post", title=title, text=text, author=user,
+            category=published_category, location=published_location,
+            **fields,
+        )
+
+    return {
+        "title": blend("Котики в городе", "Прогулка по парку."),
+        "text": blend("Прогулка", "Встретили рыжего котика у дома."),
+        "other": blend("Рецепт пирога", "Мука, яйца и сахар."),
+        "draft": blend("Котик-черновик", "Текст.", is_published=False),
+        "scheduled": blend(
+            "Котики завтра", "Текст.",
+            pub_date=timezone.now() + timedelta(days=1),
+        ),
+    }
+
+
+def search(client, query):
+    response = client.get(reverse("blog:search"), {"q": query})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_finds_word_forms_and_ranks_titles_first(
+        client, search_posts
+):
+    found = search(client, "котами")
+    expected = [search_posts["title"].id, search_posts["text"].id]
+    if search_available():
+        assert found == expected, (
+            "Убедитесь, что поиск учитывает словоформы и ставит совпадения "
+            "в заголовке выше совпадений в тексте."
+        )
+    else:
+        assert set(found) <= set(expected)
+
+
+def test_search_respects_visibility(client, search_posts):
+    found = search(client, "котик")
+    for hidden in ("draft", "scheduled", "other"):
+        assert search_posts[hidden].id not in found, (
+            "Убедитесь, что поиск показывает только опубликованные посты."
+        )
+
+
+def test_search_follows_post_changes(client, search_posts):
+    post = search_posts["other"]
+    post.title = "Пирог для котиков"
+    post.save()
+    assert post.id in search(client, "пироги котикам")
+    post.delete()
+    assert post.id not in search(client, "пирог")
+
+
+def test_fallback_ignores_case_of_cyrillic(
+        client, monkeypatch, search_posts
+):
+    monkeypatch.setattr(
+        blog_search, "search_available", lambda using="default": False
+    )
+    search_posts["other"].title = "Ёлка для КОТОВ"
+    search_posts["other"].save()
+    assert set(search(client, "котики")) == {
+        search_posts["title"].id, search_posts["text"].id
+    }, (
+        "Убедитесь, что поиск без полнотекстового индекса не зависит от"
+        " регистра кириллицы."
+    )
+    assert search(client, "елки коты") == [search_posts["other"].id]
+
+
+def test_empty_query_returns_nothing(client, search_posts):
+    assert search(client, "  ") == []
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="FTS5 index is SQLite-specific"
+)
+def test_search_query_uses_fts_index(client, search_posts):
+    assert search_available()
+    with CaptureQueriesContext(connection) as ctx:
+        search(client, "котик")
+    search_sql = next(
+        query["sql"] for query in ctx.captured_queries
+        if "MATCH" in query["sql"] and "COUNT" not in query["sql"]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {search_sql}")
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+    assert "VIRTUAL TABLE INDEX" in plan and "SCAN blog_post " not in plan, (
+        "Убедитесь, что поиск идёт по полнотекстовому индексу, а не "
+        f"перебором постов: {plan}"
+    )
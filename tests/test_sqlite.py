@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="SQLite performance profile"
+)
+
+
+def open_connection(path, init_command=""):
+    conn = sqlite3.connect(path, timeout=0, isolation_level=None)
+    for statement in init_command.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+    conn.execute("PRAGMA busy_timeout = 0")
+    return conn
+
+
+def write_while_reading(path, init_command):
+    setup = open_connection(path, init_command)
+    setup.execute("CREATE TABLE IF NOT EXISTS item (value INTEGER)")
+    setup.execute("INSERT INTO item VALUES (1)")
+    setup.close()
+
+    reader = open_connection(path, init_command)
+    writer = open_connection(path, init_command)
+    try:
+        reader.execute("BEGIN")
+        assert reader.execute("SELECT COUNT(*) FROM item").fetchone() == (1,)
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("INSERT INTO item VALUES (2)")
+        writer.execute("COMMIT")
+        snapshot = reader.execute("SELECT COUNT(*) FROM item").fetchone()
+        reader.execute("COMMIT")
+        return snapshot
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_readers_do_not_block_writers(tmp_path):
+    init_command = settings.DATABASES["default"]["OPTIONS"]["init_command"]
+    snapshot = write_while_reading(str(tmp_path / "wal.sqlite3"), init_command)
+    assert snapshot == (1,), (
+        "Убедитесь, что читатель видит согласованный снимок данных, пока"
+        " писатель фиксирует изменения."
+    )
+
+
+def test_rollback_journal_blocks_writers(tmp_path):
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        write_while_reading(str(tmp_path / "journal.sqlite3"), "")
+
+
+@pytest.mark.django_db
+def test_profile_applied_on_connection_creation():
+    pragmas = settings.SQLITE_PRAGMAS
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == pragmas["busy_timeout"]
+        cursor.execute("PRAGMA cache_size")
+        assert cursor.fetchone()[0] == pragmas["cache_size"]
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1, "synchronous = NORMAL"
+        cursor.execute("PRAGMA temp_store")
+        assert cursor.fetchone()[0] == 2, "temp_store = MEMORY"
@@ -0,0 +1,202 @@
+from datetime import timedelta
+from email.mime.text import MIMEText
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.mail import QueuedEmailBackend
+from core.models import Task
+from core.tasks import (
+    claim_next_task, enqueue, registry, run_pending_tasks, run_task, task
+)
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@task
+def flaky_task(fail_times):
+    calls.append(fail_times)
+    if len(calls) <= fail_times:
+        raise RuntimeError("temporary failure")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_post_image_is_processed_by_worker(post_with_published_location):
+    post = post_with_published_location
+    post.refresh_from_db()
+    assert not post.image_variants, (
+        "Убедитесь, что обработка изображения не выполняется в запросе."
+    )
+    assert Task.objects.filter(
+        name="blog.tasks.generate_post_derivatives", status=Task.PENDING
+    ).exists()
+
+    call_command("runworker", "--once", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.image_variants["variants"], (
+        "Убедитесь, что обработчик очереди создаёт производные изображения."
+    )
+
+
+def test_failed_task_is_retried(settings):
+    settings.TASK_MAX_ATTEMPTS = 3
+    task_row = enqueue(flaky_task, 1)
+
+    run_pending_tasks()
+    task_row.refresh_from_db()
+    assert task_row.status == Task.PENDING
+    assert task_row.attempts == 1
+    assert "temporary failure" in task_row.last_error
+    assert task_row.run_at > timezone.now()
+
+    Task.objects.filter(pk=task_row.pk).update(
+        run_at=timezone.now() - timedelta(seconds=1)
+    )
+    run_pending_tasks()
+    task_row.refresh_from_db()
+    assert task_row.status == Task.DONE
+    assert calls == [1, 1]
+
+
+def test_task_fails_after_max_attempts(settings):
+    settings.TASK_MAX_ATTEMPTS = 1
+    task_row = enqueue(flaky_task, 5)
+    run_pending_tasks()
+    task_row.refresh_from_db()
+    assert task_row.status == Task.FAILED
+
+
+def test_unregistered_task_is_rejected():
+    assert "unknown.task" not in registry
+    with pytest.raises(ValueError):
+        enqueue("unknown.task")
+
+
+def test_emails_are_sent_by_worker(settings):
+    settings.TASK_EMAIL_BACKEND = (
+        "django.core.mail.backends.locmem.EmailBackend"
+    )
+    mail.send_mail(
+        "Тема", "Текст", "from@example.com", ["to@example.com"],
+        connection=QueuedEmailBackend(),
+    )
+    assert not mail.outbox, (
+        "Убедитесь, что письма не отправляются в потоке запроса."
+    )
+    run_pending_tasks()
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].subject == "Тема"
+    assert mail.outbox[0].to == ["to@example.com"]
+
+
+def test_task_of_dead_worker_is_reclaimed(settings):
+    settings.TASK_MAX_ATTEMPTS = 2
+    task_row = enqueue(flaky_task, 0)
+    Task.objects.filter(pk=task_row.pk).update(
+        status=Task.RUNNING, attempts=1,
+        locked_until=timezone.now() + timedelta(minutes=5),
+    )
+    assert run_pending_tasks() == 0, (
+        "Убедитесь, что задача с действующей арендой не запускается повторно."
+    )
+
+    Task.objects.filter(pk=task_row.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+    assert run_pending_tasks() == 1, (
+        "Убедитесь, что задача, аренда которой истекла, запускается снова."
+    )
+    task_row.refresh_from_db()
+    assert task_row.status == Task.DONE
+    assert task_row.attempts == 2
+    assert task_row.locked_until is None
+
+
+def test_expired_task_fails_after_max_attempts(settings):
+    settings.TASK_MAX_ATTEMPTS = 1
+    task_row = enqueue(flaky_task, 0)
+    Task.objects.filter(pk=task_row.pk).update(
+        status=Task.RUNNING, attempts=1,
+        locked_until=timezone.now() - timedelta(seconds=1),
+    )
+    assert run_pending_tasks() == 0
+    task_row.refresh_from_db()
+    assert task_row.status == Task.FAILED
+    assert not calls
+
+
+def test_worker_with_expired_lease_keeps_off_reclaimed_task():
+    task_row = enqueue(flaky_task, 0)
+    stale = claim_next_task()
+    Task.objects.filter(pk=task_row.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+    fresh = claim_next_task()
+    assert fresh.pk == stale.pk
+
+    run_task(stale)
+    task_row.refresh_from_db()
+    assert task_row.status == Task.RUNNING, (
+        "Убедитесь, что обработчик с истёкшей арендой не меняет статус "
+        "задачи, которую забрал другой обработчик."
+    )
+    run_task(fresh)
+    task_row.refresh_from_db()
+    assert task_row.status == Task.DONE
+
+
+def test_queued_email_keeps_attachments(settings):
+    settings.TASK_EMAIL_BACKEND = (
+        "django.core.mail.backends.locmem.EmailBackend"
+    )
+    message = mail.EmailMessage(
+        "Тема", "Текст", "from@example.com", ["to@example.com"],
+        connection=QueuedEmailBackend(),
+    )
+    message.attach("notes.txt", "Заметки", "text/plain")
+    message.attach("image.png", b"\x89PNG\r\n\x00", "image/png")
+    message.send()
+    assert not mail.outbox
+    run_pending_tasks()
+    assert mail.outbox[0].attachments == [
+        ("notes.txt", "Заметки", "text/plain"),
+        ("image.png", b"\x89PNG\r\n\x00", "image/png"),
+    ], "Убедитесь, что письмо из очереди отправляется с вложениями."
+
+
+def test_email_with_mime_attachment_is_sent_at_once(settings):
+    settings.TASK_EMAIL_BACKEND = (
+        "django.core.mail.backends.locmem.EmailBackend"
+    )
+    message = mail.EmailMessage(
+        "Тема", "Текст", "from@example.com", ["to@example.com"],
+        connection=QueuedEmailBackend(),
+    )
+    message.attach(MIMEText("Вложение"))
+    message.send()
+    assert len(mail.outbox) == 1, (
+        "Убедитесь, что письмо с вложением, которое нельзя поставить в "
+        "очередь, отправляется сразу."
+    )
+    assert not Task.objects.exists()
+
+
+def test_derivatives_are_queued_once_per_post(post_with_published_location):
+    post = post_with_published_location
+    for _ in range(3):
+        post.save()
+    assert Task.objects.filter(
+        name="blog.tasks.generate_post_derivatives", status=Task.PENDING,
+    ).count() == 1, (
+        "Убедитесь, что повторное сохранение поста не ставит в очередь "
+        "ещё одну обработку изображения."
+    )
@@ -0,0 +1,116 @@
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.models import Category, Comment, Location, Post
+from blog.transfer import Importer
+
+pytestmark = pytest.mark.django_db
+
+DB_JSON = Path(__file__).resolve().parent.parent / "blogicum" / "db.json"
+
+
+def snapshot():
+    return {
+        "posts": sorted(
+            Post.objects.values_list(
+                "title", "author__username", "category__slug",
+                "location__name", "created_at", "comment_count",
+            )
+        ),
+        "comments": sorted(
+            Comment.objects.values_list(
+                "text", "post__title", "author__username", "created_at"
+            )
+        ),
+    }
+
+
+@pytest.fixture
+def exported(tmp_path, comment_to_a_post, post_with_published_location):
+    path = tmp_path / "blog.jsonl"
+    call_command("export_blog", str(path), stderr=open(tmp_path / "log", "w"))
+    return path
+
+
+def test_export_writes_fixture_records(exported):
+    records = [json.loads(line) for line in exported.open(encoding="utf-8")]
+    models = [record["model"] for record in records]
+    assert models == sorted(models, key=[
+        "auth.user", "blog.category", "blog.location", "blog.post",
+        "blog.comment",
+    ].index), "Убедитесь, что записи выгружаются в порядке зависимостей."
+    assert all({"model", "pk", "fields"} == set(r) for r in records)
+
+
+def test_round_trip_into_empty_database(exported, django_user_model):
+    before = snapshot()
+    Post.objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+    django_user_model.objects.all().delete()
+
+    call_command("import_blog", str(exported), "--keep-ids",
+                 stdout=open(exported.parent / "out", "w"),
+                 stderr=open(exported.parent / "log", "w"))
+    assert snapshot() == before, (
+        "Убедитесь, что после выгрузки и загрузки данные совпадают, "
+        "включая даты создания и счётчики комментариев."
+    )
+
+
+def test_import_into_populated_database_remaps_keys(
+        exported, django_user_model
+):
+    users, posts, comments = (
+        django_user_model.objects.count(), Post.objects.count(),
+        Comment.objects.count(),
+    )
+    call_command("import_blog", str(exported), batch_size=1,
+                 stdout=open(exported.parent / "out", "w"),
+                 stderr=open(exported.parent / "log", "w"))
+    assert django_user_model.objects.count() == users, (
+        "Убедитесь, что существующие пользователи не дублируются."
+    )
+    assert Post.objects.count() == posts * 2
+    assert Comment.objects.count() == comments * 2
+    for comment in Comment.objects.select_related("post"):
+        assert comment.post.comment_count >= 1
+
+
+def test_import_legacy_fixture(tmp_path):
+    call_command("import_blog", str(DB_JSON),
+                 stdout=open(tmp_path / "out", "w"),
+                 stderr=open(tmp_path / "log", "w"))
+    assert Post.objects.count() == 39
+
+
+def test_broken_reference_aborts_import(tmp_path):
+    path = tmp_path / "broken.jsonl"
+    path.write_text(json.dumps({
+        "model": "blog.comment", "pk": 1,
+        "fields": {"post": 100, "author": 100, "text": "x"},
+    }) + "\n", encoding="utf-8")
+    with pytest.raises(CommandError, match="Строка 1: blog.post #100"):
+        call_command("import_blog", str(path))
+    assert not Comment.objects.exists()
+
+
+def test_import_leaves_other_saves_timestamped(exported):
+    saved = []
+
+    def save_meanwhile(label, count):
+        # Another request handled by the same process during the import.
+        saved.append(Location.objects.create(name=f"Во время {label}"))
+
+    Importer(progress=save_meanwhile).load(
+        exported.read_text(encoding="utf-8").splitlines()
+    )
+    assert saved
+    for location in Location.objects.filter(pk__in=[s.pk for s in saved]):
+        assert location.created_at and location.updated_at, (
+            "Убедитесь, что загрузка не отключает auto_now у полей модели "
+            "для других сохранений в том же процессе."
+        )